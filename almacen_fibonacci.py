@@ -0,0 +1,265 @@
+import json
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Carpeta del almacén local (se puede cambiar con la variable de entorno FIBONACCI_DATA_DIR)
+DEFAULT_STORE_DIR = os.environ.get(
+    "FIBONACCI_DATA_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "fibonacci")
+)
+
+# Tamaño máximo del almacén en bytes (variable FIBONACCI_DATA_MAX_BYTES; sin ella no hay límite)
+DEFAULT_MAX_BYTES = int(os.environ["FIBONACCI_DATA_MAX_BYTES"]) if os.environ.get("FIBONACCI_DATA_MAX_BYTES") else None
+
+INDEX_FILE = "index.i8"
+META_FILE = "meta.json"
+LOCKS_DIR = ".locks"
+
+
+# Candado exclusivo sobre un archivo abierto; con blocking=False devuelve False si otro proceso lo tiene
+def _acquire(f, blocking):
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        except BlockingIOError:
+            return False
+    while True:
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.05)
+
+
+def _release(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# Almacén columnar en disco: una carpeta por ticker con un archivo binario por columna
+# (más el índice en nanosegundos) que se lee como arreglo mapeado en memoria.
+# Los datos nuevos se agregan al final de cada archivo; meta.json guarda el número de filas
+# válidas, así que una escritura interrumpida nunca deja el historial a medias.
+# Con max_bytes, los tickers usados hace más tiempo se expulsan al superar el presupuesto (LRU).
+class OHLCVStore:
+    def __init__(self, root=DEFAULT_STORE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def ticker_dir(self, ticker):
+        safe_name = re.sub(r"[^A-Za-z0-9._=^-]", "_", ticker.upper())
+        return os.path.join(self.root, safe_name)
+
+    def read_meta(self, ticker):
+        path = os.path.join(self.ticker_dir(ticker), META_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, ticker, meta):
+        directory = self.ticker_dir(ticker)
+        tmp_path = os.path.join(directory, META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+    # Lee el historial completo de un ticker (None si no está en el almacén)
+    def read(self, ticker):
+        meta = self.read_meta(ticker)
+        if not meta or meta["rows"] == 0:
+            return None
+
+        directory = self.ticker_dir(ticker)
+        rows = meta["rows"]
+        try:
+            index = np.memmap(os.path.join(directory, INDEX_FILE), dtype=np.int64, mode="r", shape=(rows,))
+            columns = {
+                column["name"]: np.memmap(os.path.join(directory, column["file"]),
+                                          dtype=column["dtype"], mode="r", shape=(rows,))
+                for column in meta["columns"]
+            }
+        except (OSError, ValueError):
+            return None  # Otro proceso lo expulsó o lo está reescribiendo
+        self._record_access(ticker)
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(index.view("datetime64[ns]"), name="Date"))
+
+    # Último instante almacenado para un ticker (None si no hay datos)
+    def last_timestamp(self, ticker):
+        meta = self.read_meta(ticker)
+        if not meta or not meta.get("last"):
+            return None
+        return pd.Timestamp(meta["last"])
+
+    # Agrega barras nuevas. Si los datos se traslapan con el final del almacén
+    # (por ejemplo, la barra del día en curso), las filas traslapadas se reemplazan.
+    # Con complete=False (descargas por bloques) no se marca el ticker como actualizado.
+    def append(self, ticker, data, coverage_start=None, complete=True):
+        meta = self.read_meta(ticker)
+        if meta is None or meta["rows"] == 0:
+            return self.write(ticker, data, coverage_start=coverage_start, complete=complete)
+
+        # Alinear con las columnas ya almacenadas (las faltantes, como dividendos, valen 0)
+        data = data.reindex(columns=[c["name"] for c in meta["columns"]], fill_value=0)
+
+        directory = self.ticker_dir(ticker)
+        rows = meta["rows"]
+        new_index = data.index.values.astype("datetime64[ns]").view(np.int64)
+
+        if len(new_index) > 0 and rows > 0:
+            stored_index = np.memmap(os.path.join(directory, INDEX_FILE), dtype=np.int64, mode="r", shape=(rows,))
+            keep = int(np.searchsorted(stored_index, new_index[0], side="left"))
+            del stored_index
+        else:
+            keep = rows
+
+        # Recortar las filas que serán reemplazadas y escribir las nuevas al final.
+        # Primero se reduce el conteo de filas válidas para que una interrupción no deje filas inválidas.
+        if keep < rows:
+            meta["rows"] = keep
+            self._write_meta(ticker, meta)
+        self._truncate_and_append(directory, INDEX_FILE, np.int64, keep, new_index)
+        for column in meta["columns"]:
+            values = data[column["name"]].to_numpy(dtype=column["dtype"])
+            self._truncate_and_append(directory, column["file"], column["dtype"], keep, values)
+
+        meta["rows"] = keep + len(new_index)
+        if len(new_index) > 0:
+            meta["last"] = pd.Timestamp(new_index[-1]).isoformat()
+        if complete:
+            meta["fetched_at"] = datetime.now().isoformat()
+        if coverage_start is not None:
+            meta["coverage_start"] = coverage_start
+        self._write_meta(ticker, meta)
+        return meta["rows"]
+
+    # Reemplaza por completo el historial almacenado de un ticker
+    def write(self, ticker, data, coverage_start=None, complete=True):
+        directory = self.ticker_dir(ticker)
+        os.makedirs(directory, exist_ok=True)
+
+        columns = []
+        for position, name in enumerate(data.columns):
+            dtype = np.dtype(data[name].dtype)
+            if dtype.kind not in "iuf":
+                dtype = np.dtype(np.float64)
+            columns.append({"name": name, "file": f"col{position}.{dtype.str.lstrip('<>=|')}",
+                            "dtype": dtype.str})
+
+        # Invalidar los metadatos antes de reescribir los archivos
+        self._write_meta(ticker, {"columns": columns, "rows": 0, "last": None,
+                                  "fetched_at": None, "coverage_start": None})
+
+        index = data.index.values.astype("datetime64[ns]").view(np.int64)
+        self._truncate_and_append(directory, INDEX_FILE, np.int64, 0, index)
+        for column in columns:
+            values = data[column["name"]].to_numpy(dtype=column["dtype"])
+            self._truncate_and_append(directory, column["file"], column["dtype"], 0, values)
+
+        self._write_meta(ticker, {
+            "columns": columns,
+            "rows": len(index),
+            "last": pd.Timestamp(index[-1]).isoformat() if len(index) > 0 else None,
+            "fetched_at": datetime.now().isoformat() if complete else None,
+            "coverage_start": coverage_start
+        })
+        return len(index)
+
+    # Marca el ticker como revisado aunque no haya barras nuevas
+    def touch(self, ticker):
+        meta = self.read_meta(ticker)
+        if meta is not None:
+            meta["fetched_at"] = datetime.now().isoformat()
+            self._write_meta(ticker, meta)
+
+    # Candado entre procesos para un ticker. Los archivos de candado viven en .locks, que la
+    # expulsión nunca borra. Con blocking=False se entrega False si otro proceso lo tiene.
+    @contextmanager
+    def lock(self, ticker, blocking=True):
+        directory = os.path.join(self.root, LOCKS_DIR)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, os.path.basename(self.ticker_dir(ticker)) + ".lock")
+        with open(path, "a+b") as f:
+            acquired = _acquire(f, blocking)
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    _release(f)
+
+    # El último acceso se guarda como la fecha de modificación de meta.json (escribirlo también cuenta)
+    def _record_access(self, ticker):
+        try:
+            os.utime(os.path.join(self.ticker_dir(ticker), META_FILE))
+        except OSError:
+            pass  # Almacén de solo lectura
+
+    # Uso del almacén: lista de (último acceso, bytes, carpeta) por ticker
+    def usage(self):
+        entries = []
+        try:
+            directories = list(os.scandir(self.root))
+        except OSError:
+            return entries
+        for entry in directories:
+            if not entry.is_dir() or entry.name == LOCKS_DIR:
+                continue
+            try:
+                accessed = os.stat(os.path.join(entry.path, META_FILE)).st_mtime
+                size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+            except OSError:
+                continue
+            entries.append((accessed, size, entry.name))
+        return entries
+
+    # Expulsa los tickers usados hace más tiempo hasta que el almacén ocupe como máximo max_bytes.
+    # Se saltan los tickers que otro proceso está actualizando. Devuelve las carpetas borradas.
+    def evict(self, max_bytes=None):
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return []
+
+        entries = sorted(self.usage())
+        total = sum(size for _, size, _ in entries)
+        evicted = []
+        for _, size, name in entries:
+            if total <= max_bytes:
+                break
+            with self.lock(name, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                try:
+                    shutil.rmtree(os.path.join(self.root, name))
+                except OSError:
+                    continue  # En Windows no se pueden borrar archivos mapeados en memoria
+            total -= size
+            evicted.append(name)
+        return evicted
+
+    @staticmethod
+    def _truncate_and_append(directory, filename, dtype, keep_rows, values):
+        path = os.path.join(directory, filename)
+        with open(path, "ab") as f:
+            f.truncate(keep_rows * np.dtype(dtype).itemsize)
+            f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
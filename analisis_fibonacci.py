@@ -0,0 +1,167 @@
+# Análisis de retrocesos sin interfaz: carga de datos y cálculo de niveles para uno o varios tickers.
+#
+# Uso:
+#   python analisis_fibonacci.py AAPL MSFT GOOGL --days 252 --trend Alcista --output niveles.csv
+#   python analisis_fibonacci.py --tickers-file lista.txt --output niveles.json --workers 8
+# El formato de salida (csv, parquet o json) se deduce de la extensión o se indica con --format.
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from almacen_fibonacci import OHLCVStore
+from datos_fibonacci import fetch_history, INTERVALS
+from escaner_fibonacci import parse_tickers
+from niveles_fibonacci import calculate_fibonacci_levels, fibonacci_levels_batch, EXTENSION_RATIOS
+from swings_fibonacci import latest_swing_levels, DEFAULT_SWING_THRESHOLD
+
+OUTPUT_FORMATS = ("csv", "parquet", "json")
+
+
+# Niveles del período con el mismo respaldo que la página de análisis: si la cronología de los
+# extremos no coincide con la tendencia, se usa el movimiento más reciente detectado por puntos de giro.
+# Devuelve (fib_data, error, aviso); el aviso explica cuándo se usó el respaldo.
+def compute_levels(data, trend_type, swing_threshold=DEFAULT_SWING_THRESHOLD):
+    fib_data, fib_error = calculate_fibonacci_levels(data, trend_type)
+    if fib_error:
+        swing_data, _ = latest_swing_levels(data, trend_type, swing_threshold)
+        if swing_data is not None:
+            notice = (f"{fib_error} Se usa el movimiento {trend_type.lower()} más reciente "
+                      f"(mayor al {swing_threshold*100:.0f}%) detectado por puntos de giro.")
+            return swing_data, None, notice
+    return fib_data, fib_error, None
+
+
+# Analiza un ticker: descarga (o lee del almacén) el período y calcula niveles y extensiones.
+# Devuelve (resultado, error) donde resultado es un diccionario listo para exportar.
+def analyze_ticker(ticker, days=252, trend_type="Alcista", interval="1d",
+                   swing_threshold=DEFAULT_SWING_THRESHOLD, store=None, provider=None):
+    data, error, notices = fetch_history(ticker, days, store=store, interval=interval, provider=provider)
+    if error:
+        return None, error
+
+    fib_data, fib_error, notice = compute_levels(data, trend_type, swing_threshold)
+    if fib_error:
+        return None, fib_error
+    if notice:
+        notices.append(notice)
+
+    extensions = fibonacci_levels_batch([[fib_data['min_price'], fib_data['max_price']]],
+                                        EXTENSION_RATIOS, trend_type)[0]
+    return {
+        'ticker': ticker,
+        'trend_type': trend_type,
+        'interval': interval,
+        'days': days,
+        'bars': len(data),
+        'start_date': data.index[0],
+        'end_date': data.index[-1],
+        'last_close': float(data['Close'].iloc[-1]),
+        'min_price': float(fib_data['min_price']),
+        'max_price': float(fib_data['max_price']),
+        'min_date': fib_data['min_idx'],
+        'max_date': fib_data['max_idx'],
+        'source': "puntos_de_giro" if 'confirmed' in fib_data else "periodo",
+        'levels': {float(ratio): float(price) for ratio, price in fib_data['levels'].items()},
+        'extensions': dict(zip(EXTENSION_RATIOS.tolist(), extensions.tolist())),
+        'notices': notices,
+    }, None
+
+
+# Analiza varios tickers repartidos en un grupo de procesos (un ticker por tarea).
+# Devuelve (resultados en el orden recibido, diccionario ticker -> error).
+def analyze_tickers(tickers, days=252, trend_type="Alcista", interval="1d",
+                    swing_threshold=DEFAULT_SWING_THRESHOLD, store=None, provider=None, max_workers=None):
+    tickers = list(dict.fromkeys(tickers))  # Quitar duplicados conservando el orden
+    if not tickers:
+        return [], {}
+
+    options = dict(days=days, trend_type=trend_type, interval=interval, swing_threshold=swing_threshold,
+                   store=store, provider=provider)
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(tickers)))
+    if workers == 1:
+        outcomes = [analyze_ticker(ticker, **options) for ticker in tickers]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(analyze_ticker, ticker, **options) for ticker in tickers]
+            outcomes = [future.result() for future in futures]
+
+    results = [result for result, _ in outcomes if result is not None]
+    errors = {ticker: error for ticker, (_, error) in zip(tickers, outcomes) if error}
+    return results, errors
+
+
+# Tabla con una fila por ticker y nivel (retrocesos y extensiones) y los metadatos repetidos en cada fila
+def levels_table(results):
+    rows = []
+    for result in results:
+        metadata = {key: value for key, value in result.items() if key not in ('levels', 'extensions', 'notices')}
+        for kind, levels in (("retroceso", result['levels']), ("extension", result['extensions'])):
+            for ratio, price in levels.items():
+                rows.append({**metadata, 'kind': kind, 'ratio': ratio, 'price': price})
+    return pd.DataFrame(rows)
+
+
+# Escribe los resultados en CSV o Parquet (tabla de niveles) o JSON (un objeto por ticker con sus errores)
+def write_results(results, errors, path, output_format=None):
+    output_format = output_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Formato no soportado: {output_format}. Opciones: {', '.join(OUTPUT_FORMATS)}")
+
+    if output_format == "json":
+        payload = {
+            'generated_at': datetime.now().isoformat(timespec="seconds"),
+            'results': results,
+            'errors': errors,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2, default=str)
+    elif output_format == "parquet":
+        # to_parquet necesita pyarrow o fastparquet
+        levels_table(results).to_parquet(path, index=False)
+    else:
+        levels_table(results).to_csv(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula niveles de retroceso de Fibonacci sin interfaz")
+    parser.add_argument("tickers", nargs="*", help="Símbolos a analizar")
+    parser.add_argument("--tickers-file", help="Archivo con símbolos (separados por comas, espacios o líneas)")
+    parser.add_argument("--days", type=int, default=252, help="Barras (o sesiones intradía) del período; 0 = todo")
+    parser.add_argument("--trend", choices=("Alcista", "Bajista"), default="Alcista", help="Tipo de tendencia")
+    parser.add_argument("--interval", choices=list(INTERVALS), default="1d", help="Intervalo de las velas")
+    parser.add_argument("--swing-threshold", type=float, default=DEFAULT_SWING_THRESHOLD,
+                        help="Movimiento mínimo para puntos de giro (proporción, 0.05 = 5%%)")
+    parser.add_argument("--output", "-o", required=True, help="Archivo de salida (.csv, .parquet o .json)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="Formato de salida (por defecto según la extensión)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos simultáneos (por defecto, uno por núcleo)")
+    parser.add_argument("--no-store", action="store_true", help="No usar el almacén local de historiales")
+    args = parser.parse_args(argv)
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file, "r", encoding="utf-8") as f:
+            tickers.extend(parse_tickers(f.read()))
+    tickers = parse_tickers(",".join(tickers))
+    if not tickers:
+        parser.error("Indica al menos un ticker (argumentos o --tickers-file)")
+
+    store = None if args.no_store else OHLCVStore()
+    results, errors = analyze_tickers(tickers, args.days, args.trend, args.interval, args.swing_threshold,
+                                      store=store, max_workers=args.workers)
+    write_results(results, errors, args.output, args.format)
+
+    for ticker, error in errors.items():
+        print(f"{ticker}: {error}", file=sys.stderr)
+    print(f"{len(results)} de {len(tickers)} tickers analizados -> {args.output}")
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,31 @@
 import pandas as pd
 import streamlit as st
-import numpy as np
-import yfinance as yf
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from PIL import Image
-import io
-import base64
-import os
-
-# Tratamos de importar el módulo de ejemplos
-try:
-    import ejemplos_fibonacci
-    ejemplos_module_available = True
-except ImportError:
-    ejemplos_module_available = False
+
+# Los módulos pesados (yfinance, plotly, matplotlib) se importan solo en la página que los usa
+# para reducir el tiempo de arranque; ver benchmarks/bench_arranque.py
+
+from niveles_fibonacci import EXTENSION_RATIOS
+from datos_fibonacci import (fetch_full_history, fetch_histories, fetch_new_bars, slice_period, BackgroundLoader,
+                             DEFAULT_MAX_WORKERS, INTERVALS)
+from almacen_fibonacci import OHLCVStore
+from proveedores_fibonacci import get_provider
+from swings_fibonacci import DEFAULT_SWING_THRESHOLD
+from analisis_fibonacci import compute_levels
+from backtest_fibonacci import backtest_strategy, summarize_trades
+from montecarlo_fibonacci import monte_carlo_levels
+from escaner_fibonacci import parse_tickers, scan_watchlist
+from figuras_fibonacci import create_fibonacci_spiral, create_simple_spiral
+from confluencia_fibonacci import multi_timeframe_levels, confluence_zones
+from interacciones_fibonacci import level_interactions, DEFAULT_TOUCH_TOLERANCE
+from compacto_fibonacci import compact_history, CompactHistory, LevelsRecord, COMPACT_HISTORIES
+from graficos_fibonacci import (downsample_ohlc, build_fibonacci_figure, extend_fibonacci_figure,
+                                move_fibonacci_levels, DEFAULT_MAX_CANDLES)
+from ventana_fibonacci import RollingFibonacciLevels
+from metricas_fibonacci import timed, start_trace, current_trace, stage_summary, start_metrics_server
+
+# Tiempos por etapa de esta ejecución (y servidor /metrics si FIBONACCI_METRICS_PORT está definido)
+start_trace()
+start_metrics_server()
 
 # Configuración de la página
 st.set_page_config(
@@ -78,32 +88,6 @@ with st.expander("📚 Fundamentos Teóricos de Fibonacci", expanded=True):
         """)
     
     with col2:
-        # Generamos imagen didáctica de la espiral de Fibonacci
-        def create_fibonacci_spiral():
-            fig, ax = plt.subplots(figsize=(6, 6))
-            
-            # Generar secuencia Fibonacci
-            fib = [0, 1]
-            for i in range(2, 12):
-                fib.append(fib[i-1] + fib[i-2])
-            
-            # Crear espiral
-            phi = (1 + 5**0.5) / 2
-            theta = np.linspace(0, 8 * np.pi, 1000)
-            r = phi ** (theta / (np.pi/2))
-            
-            ax.plot(r * np.cos(theta), r * np.sin(theta), color='blue')
-            ax.set_title('Espiral de Fibonacci')
-            ax.axis('equal')
-            ax.grid(True)
-            ax.set_axis_off()
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png')
-            buf.seek(0)
-            plt.close(fig)
-            return buf
-        
         # Mostrar la imagen
         image_buf = create_fibonacci_spiral()
         st.image(image_buf, caption="Espiral de Fibonacci", use_container_width=True)
@@ -118,8 +102,31 @@ with st.expander("📚 Fundamentos Teóricos de Fibonacci", expanded=True):
 
 # Sección de la aplicación con múltiples páginas
 st.sidebar.title("Navegación")
-pages = ["Análisis de Retrocesos", "Ejemplos en Naturaleza y Arte"]
-selected_page = st.sidebar.radio("Ir a", pages)
+pages = ["Análisis de Retrocesos", "Escáner de Lista", "Ejemplos en Naturaleza y Arte"]
+selected_page = st.sidebar.radio("Ir a", pages, key="pagina")
+
+# Almacén local de historiales (persistente entre reinicios y compartido entre procesos)
+data_store = OHLCVStore()
+
+# Fuente de precios (Yahoo por defecto; archivos locales, datos sintéticos o una repetición con
+# FIBONACCI_PROVIDER). Se comparte entre ejecuciones porque la repetición guarda su avance.
+@st.cache_resource
+def get_market_provider():
+    return get_provider()
+
+
+market_provider = get_market_provider()
+
+# Períodos de tiempo disponibles (en días de mercado)
+period_options = {
+    "1 mes": 30,
+    "3 meses": 90,
+    "6 meses": 180,
+    "1 año": 252,
+    "2 años": 504,
+    "5 años": 1260,
+    "Máximo disponible": 0  # Valor especial para indicar sin límite
+}
 
 # Función para mostrar ejemplos básicos (respaldo)
 def show_basic_examples():
@@ -133,26 +140,6 @@ def show_basic_examples():
     4. Esta proporción aparece en la naturaleza, arte y mercados financieros
     """)
     
-    # Crear una espiral simple como demostración
-    def create_simple_spiral():
-        fig, ax = plt.subplots(figsize=(8, 8))
-        theta = np.linspace(0, 8 * np.pi, 1000)
-        a = 0.15
-        r = a * np.exp(theta * 0.3)
-        x = r * np.cos(theta)
-        y = r * np.sin(theta)
-        ax.plot(x, y, 'b-')
-        ax.set_title("Espiral inspirada en Fibonacci")
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3)
-        ax.set_axis_off()
-        
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        plt.close(fig)
-        return buf
-    
     st.image(create_simple_spiral(), caption="Espiral inspirada en la proporción áurea", use_container_width=True)
 
 # Mostrar contenido según la página seleccionada
@@ -174,289 +161,213 @@ if selected_page == "Análisis de Retrocesos":
 
     with col2:
         # Período de tiempo
-        period_options = {
-            "1 mes": 30,
-            "3 meses": 90,
-            "6 meses": 180,
-            "1 año": 252,
-            "2 años": 504,
-            "5 años": 1260,
-            "Máximo disponible": 0  # Valor especial para indicar sin límite
-        }
         selected_period = st.selectbox("Selecciona el período:", list(period_options.keys()))
         days = period_options[selected_period]
 
+        # Intervalo de las velas (los intradía solo tienen la historia reciente que conserva Yahoo)
+        interval = st.selectbox("Intervalo de las velas:", list(INTERVALS.keys()),
+                                format_func=lambda i: INTERVALS[i]["label"],
+                                help="En intervalos intradía el período cuenta sesiones de mercado")
+
     with col3:
         # Selección del tipo de análisis
         trend_type = st.radio("Tipo de tendencia para análisis:", ("Alcista", "Bajista"))
 
-    # Cargar datos
-    @st.cache_data(ttl=3600)  # Caché de 1 hora
-    def load_data(ticker, days):
-        end_date = datetime.now()
-        
-        # No limitamos con días específicos al inicio, solo al final tomaremos los datos necesarios
-        start_date = end_date - timedelta(days=days*3)  # Solicitamos el triple para tener suficientes datos
-        
-        try:
-            # Método recomendado con la nueva versión de yfinance
-            ticker_obj = yf.Ticker(ticker)
-            data = ticker_obj.history(start=start_date)
-            
-            # Eliminar zona horaria del índice
-            if data.index.tzinfo is not None:
-                data.index = data.index.tz_localize(None)
-            
-            # Verificar y eliminar valores nulos
-            na_count = data.isna().sum().sum()
-            if na_count > 0:
-                st.warning(f"Se encontraron {na_count} valores NA en los datos. Se eliminarán automáticamente.")
-                data = data.dropna()
-            
-            if data.empty:
-                return None, "No se encontraron datos para el ticker seleccionado."
-                
-            # Verificar que tenemos suficientes datos
-            if len(data) < 30:
-                st.warning("ADVERTENCIA: Pocos datos disponibles. Los resultados pueden no ser confiables.")
-            
-            # Si queremos limitar los días, lo hacemos aquí
-            if days > 0:
-                data = data.tail(days)  # Nos quedamos con los días solicitados
-            
-            return data, None
-        except Exception as e:
-            return None, f"Error al cargar datos: {str(e)}"
-
-    # Función para calcular retrocesos de Fibonacci
-    def calculate_fibonacci_levels(data, trend_type):
-        try:
-            if trend_type == "Alcista":
-                # Para tendencia alcista, calculamos retrocesos del punto más bajo al más alto
-                min_price = data['Low'].min()
-                max_price = data['High'].max()
-                min_idx = data['Low'].idxmin()
-                max_idx = data['High'].idxmax()
-            else:
-                # Para tendencia bajista, calculamos retrocesos del punto más alto al más bajo
-                max_price = data['High'].max()
-                min_price = data['Low'].min()
-                max_idx = data['High'].idxmax()
-                min_idx = data['Low'].idxmin()
-            
-            # Verificar cronología para determinar si el análisis es relevante
-            # Manejo seguro de la comparación de fechas
-            if isinstance(min_idx, pd.Series):
-                min_idx_value = min_idx.iloc[0]
-            else:
-                min_idx_value = min_idx
-                
-            if isinstance(max_idx, pd.Series):
-                max_idx_value = max_idx.iloc[0]
-            else:
-                max_idx_value = max_idx
-            
-            if trend_type == "Alcista":
-                # Si el máximo ocurre antes que el mínimo en una tendencia alcista, no es válido
-                if max_idx_value < min_idx_value:
-                    return None, "La cronología de puntos extremos no es adecuada para el tipo de tendencia seleccionada."
-            else:  # Bajista
-                # Si el mínimo ocurre antes que el máximo en una tendencia bajista, no es válido
-                if min_idx_value < max_idx_value:
-                    return None, "La cronología de puntos extremos no es adecuada para el tipo de tendencia seleccionada."
-            
-            # Calcular los niveles de retroceso
-            diff = max_price - min_price
-            levels = {
-                0.0: max_price if trend_type == "Bajista" else min_price,
-                0.236: max_price - 0.236 * diff if trend_type == "Bajista" else min_price + 0.236 * diff,
-                0.382: max_price - 0.382 * diff if trend_type == "Bajista" else min_price + 0.382 * diff,
-                0.5: max_price - 0.5 * diff if trend_type == "Bajista" else min_price + 0.5 * diff,
-                0.618: max_price - 0.618 * diff if trend_type == "Bajista" else min_price + 0.618 * diff,
-                0.786: max_price - 0.786 * diff if trend_type == "Bajista" else min_price + 0.786 * diff,
-                1.0: min_price if trend_type == "Bajista" else max_price
-            }
-            
-            return {
-                'levels': levels,
-                'min_price': min_price,
-                'max_price': max_price,
-                'min_idx': min_idx,
-                'max_idx': max_idx
-            }, None
-        except Exception as e:
-            return None, f"Error al calcular niveles de Fibonacci: {str(e)}"
+    # Cargador en segundo plano compartido por todas las sesiones
+    @st.cache_resource
+    def get_background_loader():
+        return BackgroundLoader()
+
+    # Empezar a descargar el ticker escrito sin esperar a "Analizar" (no bloquea la página)
+    latest_future = None
+    if ticker.strip():
+        latest_future, _ = get_background_loader().prefetch(ticker, interval, data_store, market_provider)
+
+    # Historial completo por ticker (desde el almacén local; solo se descargan las barras nuevas).
+    # La caché depende solo del ticker y del intervalo, así que cambiar de período no vuelve a descargar nada.
+    # Con FIBONACCI_COMPACT_CACHE=1 se guarda como CompactHistory (si no se puede compactar, completo).
+    @st.cache_resource(ttl=3600)  # Caché de 1 hora
+    def load_history(ticker, interval="1d"):
+        data, error, notices = fetch_full_history(ticker, store=data_store, interval=interval,
+                                                  provider=market_provider)
+        if data is not None and COMPACT_HISTORIES:
+            compact, _ = compact_history(data)
+            if compact is not None:
+                data = compact
+        return data, error, notices
+
+    # Período de un historial en caché como DataFrame (vista del historial completo, o el período
+    # expandido desde la representación compacta)
+    def history_period(history, days=0, interval="1d"):
+        if isinstance(history, CompactHistory):
+            return history.period(days, interval).to_frame()
+        return slice_period(history, days, interval)
+
+    # Cargar datos del período seleccionado
+    def load_data(ticker, days, interval="1d"):
+        with timed("carga_datos"):
+            data, error, notices = load_history(ticker, interval)
+        for notice in notices:
+            st.warning(notice)
+        if error:
+            return None, error
+        return history_period(data, days, interval), None
 
     # Configuración avanzada en la barra lateral
     st.sidebar.header("Configuración Avanzada")
     show_volume = st.sidebar.checkbox("Mostrar volumen en gráfico", value=False)
     extended_levels = st.sidebar.checkbox("Mostrar niveles de extensión (1.272, 1.618)", value=False)
+    swing_threshold = st.sidebar.slider("Movimiento mínimo para puntos de giro (%)", 1, 30,
+                                        int(DEFAULT_SWING_THRESHOLD * 100),
+                                        help="Se usa cuando la cronología de los extremos del período no coincide con la tendencia") / 100
+    max_candles = st.sidebar.select_slider("Máximo de velas en el gráfico", options=[250, 500, 1000, 2000, 5000, 0],
+                                           value=DEFAULT_MAX_CANDLES,
+                                           format_func=lambda v: "Completo" if v == 0 else str(v),
+                                           help="Los historiales largos se agrupan en velas que conservan apertura, máximo, mínimo y cierre")
+    touch_tolerance = st.sidebar.slider("Tolerancia de toque (%)", 0.1, 2.0, DEFAULT_TOUCH_TOLERANCE * 100, 0.1,
+                                        help="Distancia al nivel dentro de la cual una barra cuenta como toque") / 100
+    live_mode = st.sidebar.checkbox("Modo en vivo", value=False,
+                                    help="Consulta barras nuevas periódicamente y actualiza solo el gráfico")
+    live_seconds = st.sidebar.select_slider("Actualizar cada (segundos)", options=[2, 5, 10, 30, 60], value=5,
+                                            disabled=not live_mode)
+    show_performance = st.sidebar.checkbox("Mostrar panel de rendimiento", value=False)
+    performance_panel = st.sidebar.container()
 
-    # Cargar datos cuando se hace clic en el botón
+    # Cargar datos cuando se hace clic en el botón. El análisis sigue visible mientras se
+    # ajustan las opciones del gráfico y se oculta al cambiar ticker, período o tendencia.
+    analysis_params = (ticker, days, interval, trend_type)
     if st.button("Analizar"):
+        st.session_state["analisis"] = analysis_params
+
+    # Gráfico en vivo: cada `live_seconds` se vuelve a ejecutar solo este fragmento. Las barras nuevas se
+    # agregan a la figura guardada en la sesión y solo se mueven las líneas de los niveles que cambiaron,
+    # en lugar de recalcular el período y reconstruir la figura completa.
+    @st.fragment(run_every=live_seconds)
+    def show_live_chart():
+        live = st.session_state["en_vivo"]
+        new_bars, live_error = fetch_new_bars(ticker, live["last"], interval, market_provider)
+        if live_error:
+            st.warning(live_error)
+        elif not new_bars.empty:
+            with timed("en_vivo"):
+                changed = live["levels"].extend(new_bars)
+                extend_fibonacci_figure(live["fig"], new_bars, live["max_candles"])
+                if live["moves_levels"] and changed:
+                    live_fib_data, _ = live["levels"].fib_data()
+                    move_fibonacci_levels(live["fig"], changed, live_fib_data)
+                    live["changed"] = changed
+            live["last"] = new_bars.index[-1]
+
+        with timed("envio_grafico"):
+            st.plotly_chart(live["fig"], use_container_width=True, key="grafico_en_vivo")
+        moved = ", ".join(f"{ratio*100:.1f}%" for ratio in live.get("changed", {}))
+        st.caption(f"Última barra: {live['last']:%d/%m/%Y %H:%M}"
+                   + (f" · Últimos niveles movidos: {moved}" if moved else ""))
+
+    # Precio actual y cambio a partir de las últimas barras
+    def show_price_metric(column, bars):
+        precio_actual = float(bars['Close'].iloc[-1])
+        cambio_precio = float(bars['Close'].iloc[-1] - bars['Close'].iloc[-2]) if len(bars) > 1 else None
+        column.metric("Precio Actual", f"${precio_actual:.2f}",
+                      f"{cambio_precio:.2f}" if cambio_precio is not None else None)
+
+    if st.session_state.get("analisis") == analysis_params:
+        interval_label = "" if interval == "1d" else f" ({INTERVALS[interval]['label']})"
+        st.subheader(f"Análisis de {ticker} - Últimos {days} días{interval_label}")
+        col1, col2, col3 = st.columns(3)
+
+        # El precio actual se muestra en cuanto llegan las últimas barras, antes del historial completo
+        latest_bars = None
+        if latest_future is not None:
+            with timed("ultimas_barras"):
+                latest_bars, _ = latest_future.result()
+            if latest_bars is not None:
+                show_price_metric(col1, latest_bars)
+
         with st.spinner("Cargando datos y calculando retrocesos..."):
             try:
-                data, error = load_data(ticker, days)
+                data, error = load_data(ticker, days, interval)
                 
                 if error:
                     st.error(error)
                 else:
-                    st.subheader(f"Análisis de {ticker} - Últimos {days} días")
-                    
                     # Mostrar información básica
-                    col1, col2, col3 = st.columns(3)
-                    # Corregir el formato de string para evitar el error
-                    precio_actual = float(data['Close'].iloc[-1])
-                    cambio_precio = float(data['Close'].iloc[-1] - data['Close'].iloc[-2])
+                    if latest_bars is None:
+                        show_price_metric(col1, data)
                     precio_max = float(data['High'].max())
                     precio_min = float(data['Low'].min())
                     
-                    col1.metric("Precio Actual", f"${precio_actual:.2f}", f"{cambio_precio:.2f}")
                     col2.metric("Máximo Período", f"${precio_max:.2f}")
                     col3.metric("Mínimo Período", f"${precio_min:.2f}")
                     
-                    # Calcular niveles de Fibonacci
-                    fib_data, fib_error = calculate_fibonacci_levels(data, trend_type)
+                    # Calcular niveles de Fibonacci (si los extremos globales no sirven,
+                    # se usa el movimiento significativo más reciente)
+                    with timed("niveles"):
+                        fib_data, fib_error, fib_notice = compute_levels(data, trend_type, swing_threshold)
+                    if fib_data is not None and COMPACT_HISTORIES:
+                        fib_data = LevelsRecord.from_dict(fib_data)
+                    if fib_notice:
+                        st.info(fib_notice)
                     
                     if fib_error:
                         st.warning(fib_error)
                     else:
-                        # Visualizar con plotly
-                        fig = go.Figure()
-                        
-                        # Preparar datos para el gráfico de velas
-                        dates = list(data.index)
-                        open_values = list(data['Open'])
-                        high_values = list(data['High'])
-                        low_values = list(data['Low'])
-                        close_values = list(data['Close'])
-                        
-                        # Agregar gráfico de velas
-                        fig.add_trace(go.Candlestick(
-                            x=dates,
-                            open=open_values,
-                            high=high_values,
-                            low=low_values,
-                            close=close_values,
-                            name="Precio",
-                            increasing_line_color='green',
-                            decreasing_line_color='red'
-                        ))
-                        
-                        # Agregar líneas de retroceso de Fibonacci
-                        colors = ['red', 'orange', 'gold', 'green', 'blue', 'purple', 'magenta']
-                        levels = fib_data['levels']
-                        
-                        for i, (ratio, price) in enumerate(levels.items()):
-                            # Asegurarse de que 'price' sea un valor escalar
-                            if isinstance(price, pd.Series):
-                                price_value = float(price.iloc[0])
-                            else:
-                                price_value = float(price)
-                            
-                            # Asegurarse de que 'ratio' sea un valor escalar    
-                            if isinstance(ratio, pd.Series):
-                                ratio_value = float(ratio.iloc[0])
-                            else:
-                                ratio_value = float(ratio)
-                            
-                            fig.add_hline(
-                                y=price_value,  # Usar el valor escalar
-                                line_dash="dash",
-                                line_color=colors[i],
-                                annotation_text=f"Retroceso {ratio_value*100:.1f}%: ${price_value:.2f}",
-                                annotation_position="right"
-                            )
-                        
-                        # Convertir valores extremos a escalares si son Series
-                        min_price_value = float(fib_data['min_price']) if isinstance(fib_data['min_price'], pd.Series) else float(fib_data['min_price'])
-                        max_price_value = float(fib_data['max_price']) if isinstance(fib_data['max_price'], pd.Series) else float(fib_data['max_price'])
-                        
-                        # Para los índices, mantenerlos como están si son fechas que Plotly puede manejar
-                        min_idx_value = fib_data['min_idx']
-                        max_idx_value = fib_data['max_idx']
-                        
-                        # Resaltar puntos extremos
-                        fig.add_trace(go.Scatter(
-                            x=[min_idx_value, max_idx_value],
-                            y=[min_price_value, max_price_value],
-                            mode='markers',
-                            marker=dict(size=12, color='red'),
-                            name='Puntos Extremos'
-                        ))
-                        
-                        # Configurar gráfico
-                        fig.update_layout(
-                            title=f"Retrocesos de Fibonacci para {ticker} - Tendencia {trend_type}",
-                            xaxis_title="Fecha",
-                            yaxis_title="Precio",
-                            height=600,
-                            xaxis_rangeslider_visible=False,
-                            hovermode='x unified',
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            ),
-                            plot_bgcolor='white',
-                            xaxis=dict(showgrid=True, gridcolor='lightgray'),
-                            yaxis=dict(showgrid=True, gridcolor='lightgray')
-                        )
-                        
-                        # Opcional: mostrar volumen si está activado
-                        if show_volume:
-                            volume_data = list(data['Volume'])
-                            colors = ['green' if close_values[i] > open_values[i] else 'red' 
-                                    for i in range(len(close_values))]
-                            
-                            fig.add_trace(go.Bar(
-                                x=dates,
-                                y=volume_data,
-                                name="Volumen",
-                                marker_color=colors,
-                                opacity=0.3,
-                                yaxis="y2"
-                            ))
-                            
-                            fig.update_layout(
-                                yaxis2=dict(
-                                    title="Volumen",
-                                    overlaying="y",
-                                    side="right",
-                                    showgrid=False
-                                )
+                        # Rango visible del gráfico: al acotarlo se recupera la resolución completa
+                        chart_data = data
+                        if live_mode:
+                            # En vivo se muestran las últimas velas sin agrupar para poder agregarles barras.
+                            # La figura se envía completa en cada actualización, así que "Completo" se limita
+                            # al máximo de velas por defecto.
+                            live_candles = max_candles or DEFAULT_MAX_CANDLES
+                            chart_data = data.iloc[-live_candles:]
+                        elif len(data) > 1:
+                            range_start, range_end = st.slider(
+                                "Rango del gráfico",
+                                min_value=data.index[0].to_pydatetime(),
+                                max_value=data.index[-1].to_pydatetime(),
+                                value=(data.index[0].to_pydatetime(), data.index[-1].to_pydatetime()),
+                                format="DD/MM/YYYY" if interval == "1d" else "DD/MM/YYYY HH:mm",
+                                key=f"rango_{ticker}_{days}_{interval}"
                             )
+                            chart_data = data.loc[range_start:range_end]
                         
-                        # Opcional: mostrar niveles de extensión si está activado
-                        if extended_levels:
-                            # Añadir niveles de extensión: 1.272 y 1.618
-                            extension_levels = {}
-                            diff = max_price_value - min_price_value
-                            
-                            if trend_type == "Alcista":
-                                extension_levels[1.272] = min_price_value + 1.272 * diff
-                                extension_levels[1.618] = min_price_value + 1.618 * diff
-                            else:  # Bajista
-                                extension_levels[1.272] = max_price_value - 1.272 * diff
-                                extension_levels[1.618] = max_price_value - 1.618 * diff
-                            
-                            # Añadir las líneas de extensión
-                            for ratio, price in extension_levels.items():
-                                fig.add_hline(
-                                    y=price,
-                                    line_dash="dot",
-                                    line_color="darkblue",
-                                    annotation_text=f"Extensión {ratio:.3f}: ${price:.2f}",
-                                    annotation_position="left"
-                                )
+                        # Reducir el número de velas para historiales largos
+                        chart_data, bucket_size = downsample_ohlc(chart_data, max_candles)
+                        if bucket_size > 1:
+                            st.caption(f"Cada vela agrupa {bucket_size} barras ({len(chart_data)} velas). "
+                                       "Acota el rango del gráfico para ver la resolución completa.")
                         
-                        # Mostrar el gráfico
-                        st.plotly_chart(fig, use_container_width=True)
+                        # El estado en vivo se conserva mientras no cambien el análisis ni las opciones del gráfico
+                        live_key = (analysis_params, show_volume, extended_levels, max_candles, swing_threshold)
+                        if live_mode and st.session_state.get("en_vivo", {}).get("key") == live_key:
+                            show_live_chart()
+                        else:
+                            # Construir el gráfico con arreglos de NumPy (sin listas intermedias)
+                            with timed("figura"):
+                                fig = build_fibonacci_figure(chart_data, fib_data, ticker, trend_type,
+                                                             show_volume=show_volume, extended_levels=extended_levels)
+
+                            if live_mode:
+                                st.session_state["en_vivo"] = {
+                                    "key": live_key,
+                                    "fig": fig,
+                                    "last": data.index[-1],
+                                    "max_candles": live_candles,
+                                    # Las barras del período (en intradía, las de sus sesiones) forman la ventana móvil
+                                    "levels": RollingFibonacciLevels.from_data(data, len(data) if days > 0 else 0,
+                                                                               trend_type),
+                                    # Los niveles tomados de puntos de giro no dependen de los extremos de la ventana
+                                    "moves_levels": 'confirmed' not in fib_data,
+                                }
+                                show_live_chart()
+                            else:
+                                # Mostrar el gráfico (incluye serializar la figura para el navegador)
+                                with timed("envio_grafico"):
+                                    st.plotly_chart(fig, use_container_width=True)
                         
                         # Tabla de niveles de retroceso
                         st.subheader("Niveles de Retroceso de Fibonacci")
+                        levels = fib_data['levels']
                         
                         # Crear listas para la tabla asegurando que los valores sean escalares
                         nivel_list = []
@@ -470,13 +381,57 @@ if selected_page == "Análisis de Retrocesos":
                             nivel_list.append(f"{ratio_value*100:.1f}%")
                             precio_list.append(f"${price_value:.2f}")
                         
+                        # Toques, rebotes y rupturas de cada nivel dentro del período
+                        with timed("interacciones"):
+                            interactions = level_interactions(data, levels, touch_tolerance)
+                        
                         # Crear DataFrame con las listas ya formateadas
                         fib_table = pd.DataFrame({
                             "Nivel": nivel_list,
-                            "Precio": precio_list
+                            "Precio": precio_list,
+                            "Toques": interactions['touches'].to_numpy(),
+                            "Rebotes": interactions['bounces'].to_numpy(),
+                            "Rupturas": interactions['breaks'].to_numpy()
                         })
                         
                         st.table(fib_table)
+                        st.caption(f"Barras del período cuyo rango entró a ±{touch_tolerance*100:.1f}% del nivel. "
+                                   "Rebote: la barra cerró fuera de la banda del mismo lado del que venía; "
+                                   "ruptura: cerró del lado contrario.")
+                        
+                        # Zonas de confluencia: niveles de todos los períodos a partir del mismo historial
+                        st.subheader("Zonas de Confluencia Multiperíodo")
+                        # Usan el historial diario; en un análisis intradía se carga en segundo plano para no
+                        # bloquear la página con la descarga completa
+                        daily_pending = False
+                        if interval != "1d":
+                            _, daily_future = get_background_loader().prefetch(ticker, "1d", data_store, market_provider)
+                            daily_pending = not daily_future.done()
+                        if daily_pending:
+                            st.info("Las zonas de confluencia usan el historial diario, que se está cargando en segundo plano. "
+                                    "Aparecerán en la siguiente actualización de la página.")
+                        else:
+                            daily_history, daily_error, _ = load_history(ticker)
+                            if daily_error:
+                                st.info(f"No se pudieron calcular las zonas de confluencia: {daily_error}")
+                            else:
+                                full_data = history_period(daily_history)
+                                mtf_levels = multi_timeframe_levels(
+                                    full_data, {name: d for name, d in period_options.items() if d > 0}, trend_type
+                                )
+                                zones = confluence_zones(mtf_levels)
+                                if zones.empty:
+                                    st.info("Ningún período tiene una cronología válida para la tendencia seleccionada.")
+                                else:
+                                    st.caption("Niveles de distintos períodos (1 mes a 5 años) que coinciden en el mismo rango de precio. "
+                                               "Mientras más períodos y niveles clave coinciden, mayor es la fuerza de la zona.")
+                                    zones_table = zones.head(10).rename(columns={
+                                        "zone_low": "Desde", "zone_high": "Hasta", "center": "Centro", "levels": "Niveles",
+                                        "timeframes": "Períodos", "periods": "Ventanas", "ratios": "Ratios", "strength": "Fuerza"
+                                    })
+                                    st.dataframe(zones_table.style.format({"Desde": "${:.2f}", "Hasta": "${:.2f}",
+                                                                           "Centro": "${:.2f}", "Fuerza": "{:.1f}"}),
+                                                 use_container_width=True)
                         
                         # Explicación de resultados
                         st.subheader("Interpretación de Resultados")
@@ -560,6 +515,40 @@ if selected_page == "Análisis de Retrocesos":
         - El sesgo de confirmación puede llevar a interpretar incorrectamente los resultados
         """)
 
+        # Medir qué tan probabilísticos son los niveles con trayectorias simuladas del ticker seleccionado
+        st.markdown("#### Evaluación Monte Carlo de los niveles")
+        mc_col1, mc_col2, mc_col3 = st.columns(3)
+        with mc_col1:
+            mc_paths = st.select_slider("Trayectorias simuladas:", options=[1_000, 10_000, 50_000, 100_000],
+                                        value=10_000)
+        with mc_col2:
+            mc_method = st.radio("Simulación:", ("bootstrap", "normal"),
+                                 format_func=lambda m: "Remuestreo de barras" if m == "bootstrap" else "Rendimientos normales")
+        with mc_col3:
+            mc_period = st.selectbox("Ventana de formación:", [p for p in period_options if 0 < period_options[p] <= 252],
+                                     index=1, key="mc_periodo")
+
+        st.caption("Cada trayectoria forma sus niveles en la ventana elegida y se evalúa durante las 60 barras siguientes. "
+                   "Rebote: tras tocar el nivel, el precio regresa al nivel anterior antes de cruzar el siguiente.")
+
+        if st.button("Ejecutar simulación"):
+            with st.spinner("Simulando trayectorias..."):
+                mc_data, mc_error = load_data(ticker, 0)
+                if mc_error:
+                    st.error(mc_error)
+                else:
+                    mc_results = monte_carlo_levels(mc_data, trend_type, paths=mc_paths,
+                                                    period=period_options[mc_period], method=mc_method)
+                    st.dataframe(pd.DataFrame({
+                        "Nivel": [f"{r*100:.1f}%" for r in mc_results['ratio']],
+                        "Toques (%)": (mc_results['hit_rate'] * 100).round(1),
+                        "Rebotes (%)": (mc_results['bounce_rate'] * 100).round(1),
+                        "Rupturas (%)": (mc_results['break_rate'] * 100).round(1),
+                        "Barras hasta el toque": mc_results['avg_bars_to_hit'].round(1),
+                    }), use_container_width=True)
+                    st.caption(f"{int(mc_results['paths'].iloc[0]):,} de {mc_paths:,} trayectorias tuvieron "
+                               f"una cronología válida para la tendencia {trend_type.lower()}.")
+
     # Sección de ejercicios prácticos para estudiantes
     with st.expander("✏️ Ejercicios Prácticos", expanded=False):
         st.markdown("""
@@ -590,7 +579,118 @@ if selected_page == "Análisis de Retrocesos":
         4. Calcula la relación riesgo/beneficio y la tasa de éxito
         """)
 
+        # Backtest automático de la estrategia del Ejercicio 3 con el ticker seleccionado
+        st.markdown("#### Backtesting automático del Ejercicio 3")
+        bt_col1, bt_col2, bt_col3 = st.columns(3)
+        with bt_col1:
+            bt_entry = st.selectbox("Nivel de entrada:", [0.382, 0.5, 0.618, 0.786], index=2,
+                                    format_func=lambda r: f"{r*100:.1f}%")
+        with bt_col2:
+            bt_target = st.selectbox("Toma de ganancias (extensión):", EXTENSION_RATIOS.tolist(),
+                                     format_func=lambda r: f"{r:.3f}")
+        with bt_col3:
+            bt_period = st.selectbox("Ventana de formación:", [p for p in period_options if period_options[p] > 0], index=1)
+
+        st.caption("El stop se coloca en el nivel de retroceso anterior al de entrada. "
+                   "Cada operación dura como máximo lo mismo que la ventana de formación.")
+
+        if st.button("Ejecutar backtest"):
+            with st.spinner("Ejecutando backtest..."):
+                bt_data, bt_error = load_data(ticker, 0)
+                if bt_error:
+                    st.error(bt_error)
+                else:
+                    trades = backtest_strategy(bt_data, trend_type, bt_entry, bt_target, period_options[bt_period])
+                    summary = summarize_trades(trades)
+                    if summary['trades'] == 0:
+                        st.warning("La estrategia no generó operaciones con estos parámetros.")
+                    else:
+                        m1, m2, m3, m4 = st.columns(4)
+                        m1.metric("Operaciones", summary['trades'])
+                        m2.metric("Tasa de éxito", f"{summary['win_rate']*100:.1f}%")
+                        m3.metric("Retorno promedio", f"{summary['avg_return']*100:.2f}%")
+                        m4.metric("Riesgo/Beneficio", f"1:{summary['avg_risk_reward']:.2f}")
+                        st.dataframe(trades, use_container_width=True)
+
+    # Panel de rendimiento: se llena al final, cuando ya se midieron todas las etapas de esta ejecución
+    if show_performance:
+        with performance_panel:
+            st.subheader("Rendimiento")
+            run_steps = current_trace()
+            if run_steps:
+                st.caption("Esta ejecución")
+                st.dataframe(pd.DataFrame({
+                    "Etapa": [stage for stage, _ in run_steps],
+                    "ms": [round(seconds * 1000, 1) for _, seconds in run_steps],
+                }), hide_index=True, use_container_width=True)
+            summary_rows = stage_summary()
+            if summary_rows:
+                st.caption("Acumulado del servidor (p50 / p95 de las últimas mediciones)")
+                st.dataframe(pd.DataFrame({
+                    "Etapa": [row['stage'] for row in summary_rows],
+                    "Llamadas": [row['count'] for row in summary_rows],
+                    "p50 ms": [round(row['p50'] * 1000, 1) for row in summary_rows],
+                    "p95 ms": [round(row['p95'] * 1000, 1) for row in summary_rows],
+                    "Errores": [row['errors'] for row in summary_rows],
+                }), hide_index=True, use_container_width=True)
+            else:
+                st.caption("Haz clic en \"Analizar\" para medir las etapas.")
+
+elif selected_page == "Escáner de Lista":
+    st.header("🔎 Escáner de Lista de Seguimiento")
+    st.markdown("""
+    Analiza muchos tickers a la vez y ordena cuáles están más cerca de sus niveles clave
+    de retroceso (38.2%, 50% y 61.8%). Las descargas se realizan en paralelo.
+    """)
+
+    tickers_text = st.text_area("Tickers (separados por comas, espacios o saltos de línea):",
+                                "AAPL, MSFT, GOOGL, META, AMZN, NVDA, TSLA, SPY")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        scan_period = st.selectbox("Selecciona el período:", list(period_options.keys()), index=3)
+        scan_days = period_options[scan_period]
+    with col2:
+        scan_trend = st.radio("Tipo de tendencia para análisis:", ("Alcista", "Bajista"))
+    with col3:
+        scan_workers = st.slider("Descargas simultáneas:", 1, 32, DEFAULT_MAX_WORKERS)
+
+    # Los historiales se guardan en el almacén local, así que repetir el escaneo solo descarga barras nuevas
+    def load_watchlist(tickers, days, max_workers):
+        return fetch_histories(tickers, days, max_workers=max_workers, store=data_store,
+                               provider=market_provider)
+
+    if st.button("Escanear"):
+        watchlist = parse_tickers(tickers_text)
+        if not watchlist:
+            st.warning("Ingresa al menos un ticker.")
+        else:
+            with st.spinner(f"Descargando {len(watchlist)} tickers y calculando retrocesos..."):
+                histories = load_watchlist(tuple(watchlist), scan_days, scan_workers)
+                scan_table, scan_errors = scan_watchlist(histories, scan_trend)
+
+            if scan_table.empty:
+                st.warning("Ningún ticker produjo niveles válidos para el tipo de tendencia seleccionado.")
+            else:
+                st.subheader("Tickers más cercanos a sus niveles clave")
+                st.caption("Haz clic en el encabezado de una columna para ordenar la tabla.")
+                number_format = {column: "{:.2f}" for column in scan_table.columns
+                                 if column not in ("Ticker", "Nivel más cercano")}
+                st.dataframe(scan_table.style.format(number_format), use_container_width=True)
+
+            if scan_errors:
+                with st.expander(f"Tickers sin resultado ({len(scan_errors)})", expanded=False):
+                    st.table(pd.DataFrame({"Ticker": list(scan_errors.keys()),
+                                           "Motivo": list(scan_errors.values())}))
+
 elif selected_page == "Ejemplos en Naturaleza y Arte":
+    # Tratamos de importar el módulo de ejemplos (carga matplotlib solo en esta página)
+    try:
+        import ejemplos_fibonacci
+        ejemplos_module_available = True
+    except ImportError:
+        ejemplos_module_available = False
+
     # Si el módulo de ejemplos está disponible, lo usamos
     if ejemplos_module_available:
         ejemplos_fibonacci.app()
@@ -0,0 +1,162 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from niveles_fibonacci import fibonacci_levels_batch, RETRACEMENT_RATIOS, EXTENSION_RATIOS
+
+
+# Backtest vectorizado de la estrategia del "Ejercicio 3":
+#   - Los niveles se calculan sobre una ventana de formación de `period` barras
+#     (misma regla que calculate_fibonacci_levels: extremos del período y cronología válida)
+#   - Entrada con orden límite en el nivel `entry_ratio`
+#   - Stop en el nivel anterior de retroceso (el siguiente nivel más allá de la entrada)
+#   - Toma de ganancias en la extensión `target_ratio` (1.272 o 1.618)
+#   - Si no se toca ni el stop ni el objetivo en `holding` barras, se cierra al último cierre
+# Todas las ventanas se evalúan a la vez sobre arreglos (ventanas x barras); no hay ciclos por fila.
+# Devuelve un DataFrame con una fila por operación.
+def backtest_strategy(data, trend_type="Alcista", entry_ratio=0.618, target_ratio=1.272,
+                      period=90, holding=None, step=None):
+    ratios = RETRACEMENT_RATIOS.tolist()
+    if entry_ratio not in ratios or entry_ratio == 0.0:
+        raise ValueError(f"entry_ratio debe ser uno de {ratios[1:]}")
+    stop_ratio = ratios[ratios.index(entry_ratio) - 1]
+    holding = holding or period
+    step = step or holding
+
+    highs = data['High'].to_numpy(dtype=np.float64)
+    lows = data['Low'].to_numpy(dtype=np.float64)
+    closes = data['Close'].to_numpy(dtype=np.float64)
+    n = len(closes)
+    if n < period + holding:
+        return _empty_trades()
+
+    starts = np.arange(0, n - period - holding + 1, step)
+
+    # Extremos de cada ventana de formación
+    formation_highs = sliding_window_view(highs, period)[starts]
+    formation_lows = sliding_window_view(lows, period)[starts]
+    max_pos = formation_highs.argmax(axis=1)
+    min_pos = formation_lows.argmin(axis=1)
+    max_prices = formation_highs[np.arange(len(starts)), max_pos]
+    min_prices = formation_lows[np.arange(len(starts)), min_pos]
+
+    # Misma validación de cronología que calculate_fibonacci_levels
+    bearish = trend_type == "Bajista"
+    valid = (min_pos >= max_pos) if bearish else (max_pos >= min_pos)
+
+    levels = fibonacci_levels_batch(np.column_stack([min_prices, max_prices]),
+                                    [entry_ratio, stop_ratio, target_ratio], trend_type)
+    entry, stop, target = levels[:, 0:1], levels[:, 1:2], levels[:, 2:3]
+
+    # Ventanas de operación inmediatamente posteriores a cada formación
+    trade_highs = sliding_window_view(highs, holding)[starts + period]
+    trade_lows = sliding_window_view(lows, holding)[starts + period]
+    last_closes = closes[starts + period + holding - 1]
+
+    if bearish:
+        entry_hit = trade_highs >= entry
+        stop_hit = trade_highs >= stop
+        target_hit = trade_lows <= target
+    else:
+        entry_hit = trade_lows <= entry
+        stop_hit = trade_lows <= stop
+        target_hit = trade_highs >= target
+
+    has_entry = entry_hit.any(axis=1) & valid
+    entry_pos = np.where(has_entry, entry_hit.argmax(axis=1), holding)
+
+    # Solo cuentan el stop y el objetivo a partir de la barra de entrada
+    active = np.arange(holding)[np.newaxis, :] >= entry_pos[:, np.newaxis]
+    stop_hit &= active
+    target_hit &= active
+    stop_pos = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), holding)
+    target_pos = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), holding)
+
+    # Si stop y objetivo ocurren en la misma barra se asume el stop (criterio conservador)
+    stopped = stop_pos < holding
+    stopped &= stop_pos <= target_pos
+    reached = (target_pos < holding) & ~stopped
+    exit_price = np.where(stopped, stop[:, 0], np.where(reached, target[:, 0], last_closes))
+    exit_pos = np.where(stopped, stop_pos, np.where(reached, target_pos, holding - 1))
+
+    direction = -1.0 if bearish else 1.0
+    returns = direction * (exit_price - entry[:, 0]) / entry[:, 0]
+    risk = np.abs(entry[:, 0] - stop[:, 0])
+    reward = np.abs(target[:, 0] - entry[:, 0])
+
+    rows = np.flatnonzero(has_entry)
+    index = data.index
+    trades = pd.DataFrame({
+        'entry_date': index[starts[rows] + period + entry_pos[rows]],
+        'exit_date': index[starts[rows] + period + exit_pos[rows]],
+        'entry_price': entry[rows, 0],
+        'stop_price': stop[rows, 0],
+        'target_price': target[rows, 0],
+        'exit_price': exit_price[rows],
+        'outcome': np.where(stopped[rows], "stop", np.where(reached[rows], "objetivo", "tiempo")),
+        'return': returns[rows],
+        'risk_reward': np.divide(reward[rows], risk[rows], out=np.full(len(rows), np.nan), where=risk[rows] > 0)
+    })
+    return trades
+
+
+def _empty_trades():
+    return pd.DataFrame(columns=['entry_date', 'exit_date', 'entry_price', 'stop_price', 'target_price',
+                                 'exit_price', 'outcome', 'return', 'risk_reward'])
+
+
+# Resumen de un backtest: número de operaciones, tasa de éxito, retorno y relación riesgo/beneficio
+def summarize_trades(trades):
+    count = len(trades)
+    if count == 0:
+        return {'trades': 0, 'win_rate': np.nan, 'avg_return': np.nan,
+                'total_return': np.nan, 'avg_risk_reward': np.nan}
+    returns = trades['return'].to_numpy(dtype=np.float64)
+    return {
+        'trades': count,
+        'win_rate': float((returns > 0).mean()),
+        'avg_return': float(returns.mean()),
+        'total_return': float(np.prod(1 + returns) - 1),
+        'avg_risk_reward': float(np.nanmean(trades['risk_reward'].to_numpy(dtype=np.float64)))
+    }
+
+
+# Evalúa toda la cuadrícula de parámetros para un solo ticker (se ejecuta dentro de un proceso)
+def _run_ticker_grid(ticker, data, trend_type, entry_ratios, target_ratios, periods):
+    results = []
+    for entry_ratio, target_ratio, period in itertools.product(entry_ratios, target_ratios, periods):
+        summary = summarize_trades(backtest_strategy(data, trend_type, entry_ratio, target_ratio, period))
+        results.append({'ticker': ticker, 'entry_ratio': entry_ratio, 'target_ratio': target_ratio,
+                        'period': period, **summary})
+    return results
+
+
+# Barrido de parámetros (ratios x períodos x tickers) repartido en un grupo de procesos.
+#   histories: diccionario ticker -> DataFrame OHLC
+# Cada proceso recibe un ticker completo, de modo que el historial se envía una sola vez.
+def run_parameter_grid(histories, trend_type="Alcista", entry_ratios=(0.382, 0.5, 0.618),
+                       target_ratios=tuple(EXTENSION_RATIOS.tolist()), periods=(30, 90, 180, 252),
+                       max_workers=None):
+    histories = {ticker: data for ticker, data in histories.items() if data is not None and not data.empty}
+    if not histories:
+        return pd.DataFrame()
+
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(histories)))
+    results = []
+    if workers == 1:
+        for ticker, data in histories.items():
+            results.extend(_run_ticker_grid(ticker, data, trend_type, entry_ratios, target_ratios, periods))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_ticker_grid, ticker, data, trend_type,
+                                       entry_ratios, target_ratios, periods)
+                       for ticker, data in histories.items()]
+            for future in futures:
+                results.extend(future.result())
+
+    return pd.DataFrame(results)
@@ -0,0 +1,67 @@
+# Benchmark de arranque en frío de app.py.
+#
+# Para cada página se lanza un intérprete nuevo que ejecuta la aplicación completa con
+# streamlit.testing (sin servidor ni navegador) y se mide la primera ejecución en dos modos:
+#   - diferida: tal como está app.py (cada página importa solo lo que usa)
+#   - anticipada: importando antes todos los módulos pesados, como hacía la versión original
+# También se reporta qué módulos pesados quedaron cargados en el modo diferido
+# (algunas versiones de streamlit ya cargan plotly y PIL por sí mismas).
+#
+# Uso:
+#   python benchmarks/bench_arranque.py [--repeat 3]
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+PAGES = ["Análisis de Retrocesos", "Escáner de Lista", "Ejemplos en Naturaleza y Arte"]
+HEAVY_MODULES = ["yfinance", "plotly", "matplotlib", "PIL"]
+EAGER_IMPORTS = "import yfinance, plotly.graph_objects, matplotlib.pyplot, PIL.Image"
+
+# Ejecución en frío de una página de la aplicación
+PAGE_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+{preload}
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=300)
+at.session_state["pagina"] = {page!r}
+at.run()
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded, "errors": len(at.exception)}}))
+"""
+
+
+def _run(snippet):
+    output = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _best(page, preload, repeat):
+    snippet = PAGE_SNIPPET.format(app=APP_PATH, page=page, heavy=HEAVY_MODULES, preload=preload)
+    return min((_run(snippet) for _ in range(repeat)), key=lambda r: r["seconds"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío de app.py")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición (se reporta la mejor)")
+    args = parser.parse_args()
+
+    print(f"{'Página':<32} {'diferida':>10} {'anticipada':>11} {'ahorro':>8}  módulos pesados cargados")
+    for page in PAGES:
+        lazy = _best(page, "", args.repeat)
+        eager = _best(page, EAGER_IMPORTS, args.repeat)
+        loaded = ", ".join(lazy["loaded"]) or "ninguno"
+        print(f"{page:<32} {lazy['seconds']:9.3f}s {eager['seconds']:10.3f}s "
+              f"{eager['seconds'] - lazy['seconds']:7.3f}s  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
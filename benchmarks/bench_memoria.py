@@ -0,0 +1,114 @@
+# Benchmark de memoria de los historiales en caché: DataFrame de yfinance frente a CompactHistory.
+#
+# Para cada tamaño se genera un historial sintético con las mismas columnas y tipos que devuelve
+# yfinance (OHLC float64, Volume int64, Dividends y Stock Splits, índice de fechas) y se compara:
+#   bytes    memoria de los arreglos (memory_usage(deep=True) del DataFrame / nbytes del compacto)
+#   pickle   tamaño serializado, lo que ocuparía en una caché que copia los objetos
+#   error    diferencia máxima de precio al guardar en float32
+# Además se mide cuánto tarda compactar el historial y expandir un año (252 barras) a DataFrame,
+# se proyecta la memoria para --symbols tickers y se compara el diccionario fib_data con LevelsRecord.
+#
+# Uso:
+#   python benchmarks/bench_memoria.py [--sizes 2520,100000,1000000] [--symbols 5000]
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from compacto_fibonacci import compact_history, LevelsRecord, PRICE_COLUMNS  # noqa: E402
+from niveles_fibonacci import calculate_fibonacci_levels  # noqa: E402
+from sintetico_fibonacci import synthetic_ohlcv  # noqa: E402
+
+DEFAULT_SIZES = "2520,100000,1000000"
+
+# Hasta este tamaño las barras son diarias (días hábiles); por encima, de un minuto
+MAX_DAILY_BARS = 20_000
+
+
+# Historial con las columnas y tipos de yfinance
+def _make_history(bars):
+    freq = "B" if bars <= MAX_DAILY_BARS else "min"
+    data = synthetic_ohlcv(bars, drift=0.0, volatility=0.01 if freq == "B" else 0.001, seed=bars, freq=freq)
+    data['Volume'] = data['Volume'].astype(np.int64)
+    data['Dividends'] = 0.0
+    data['Stock Splits'] = 0.0
+    return data
+
+
+def _best_time(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _bench_size(bars):
+    data = _make_history(bars)
+    compact, error = compact_history(data)
+    if error:
+        raise RuntimeError(error)
+
+    restored = compact.to_frame()
+    price_error = max(float(np.abs(restored[name].to_numpy() - data[name].to_numpy()).max())
+                      for name in PRICE_COLUMNS)
+    return {
+        'bars': bars,
+        'frame_bytes': int(data.memory_usage(deep=True).sum()),
+        'compact_bytes': compact.nbytes,
+        'frame_pickle': len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)),
+        'compact_pickle': len(pickle.dumps(compact, protocol=pickle.HIGHEST_PROTOCOL)),
+        'price_dtype': compact.columns['Open'].dtype.name,
+        'price_error': price_error,
+        'compact_seconds': _best_time(lambda: compact_history(data)),
+        'expand_seconds': _best_time(lambda: compact.period(252).to_frame()),
+    }
+
+
+# Tamaño de un resultado de niveles como diccionario y como LevelsRecord (sin contar el diccionario
+# de niveles, que ambos comparten)
+def _record_sizes():
+    data = synthetic_ohlcv(252, drift=0.002, volatility=0.01, seed=1)
+    fib_data, error = calculate_fibonacci_levels(data, "Alcista")
+    if error:
+        fib_data, _ = calculate_fibonacci_levels(data, "Bajista")
+    return sys.getsizeof(fib_data), sys.getsizeof(LevelsRecord.from_dict(fib_data))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de los historiales en caché: DataFrame vs compacto")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Tamaños de historial separados por comas")
+    parser.add_argument("--symbols", type=int, default=5000, help="Tickers para la proyección de memoria")
+    args = parser.parse_args()
+
+    print(f"{'barras':>10} {'DataFrame MB':>13} {'compacto MB':>12} {'ahorro':>7} {'pickle MB':>10} "
+          f"{'pickle comp.':>12} {'precios':>8} {'error máx':>10} {'compactar s':>12} {'expandir s':>11}")
+    results = [_bench_size(int(size)) for size in args.sizes.split(",")]
+    for result in results:
+        saving = 1 - result['compact_bytes'] / result['frame_bytes']
+        print(f"{result['bars']:>10} {result['frame_bytes']/1e6:13.2f} {result['compact_bytes']/1e6:12.2f} "
+              f"{saving*100:6.0f}% {result['frame_pickle']/1e6:10.2f} {result['compact_pickle']/1e6:12.2f} "
+              f"{result['price_dtype']:>8} {result['price_error']:10.2e} {result['compact_seconds']:12.4f} "
+              f"{result['expand_seconds']:11.5f}")
+
+    # Proyección para la caché de una implementación con muchos tickers (historial diario más pequeño)
+    daily = results[0]
+    print(f"\nProyección para {args.symbols} tickers de {daily['bars']} barras: "
+          f"{daily['frame_bytes'] * args.symbols / 1e6:,.0f} MB con DataFrame, "
+          f"{daily['compact_bytes'] * args.symbols / 1e6:,.0f} MB compactos")
+
+    dict_size, record_size = _record_sizes()
+    print(f"Resultado de niveles: {dict_size} bytes como diccionario, {record_size} bytes como LevelsRecord")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# Benchmark del flujo de "Analizar": carga -> limpieza -> niveles -> gráfico.
+#
+# Cada etapa se mide sobre historiales sintéticos (sintetico_fibonacci) guardados como archivos
+# locales (CSV, Parquet y el almacén mapeado en memoria), sin red. Para cada tamaño se reporta
+# la mejor de varias repeticiones, el rendimiento (barras por segundo) y el pico de memoria
+# reservado durante la etapa (tracemalloc, que también registra los arreglos de NumPy).
+#
+# Etapas:
+#   carga_csv / carga_parquet / carga_almacen  lectura del historial con FileProvider
+#   limpieza       eliminación de valores NA (_drop_na)
+#   niveles        calculate_fibonacci_levels
+#   reduccion      downsample_ohlc al máximo de velas por defecto
+#   figura         build_fibonacci_figure con las velas reducidas
+#   lineas         build_fibonacci_figure con solo dos velas (costo de add_hline y sus anotaciones)
+#   serializacion  fig.to_json(), lo que st.plotly_chart envía al navegador
+#
+# Con --save los resultados se agregan a un archivo JSON Lines junto con el commit actual;
+# con --compare se comparan contra la última medición guardada de otro commit y se marcan
+# las etapas que empeoraron más que --tolerance.
+#
+# Uso:
+#   python benchmarks/bench_pipeline.py [--sizes 1000,100000,10000000] [--repeat 3]
+#                                       [--save benchmarks/resultados.jsonl] [--compare]
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from almacen_fibonacci import OHLCVStore  # noqa: E402
+from datos_fibonacci import _drop_na  # noqa: E402
+from graficos_fibonacci import build_fibonacci_figure, downsample_ohlc, DEFAULT_MAX_CANDLES  # noqa: E402
+from niveles_fibonacci import calculate_fibonacci_levels  # noqa: E402
+from proveedores_fibonacci import FileProvider  # noqa: E402
+from sintetico_fibonacci import synthetic_ohlcv  # noqa: E402
+
+DEFAULT_SIZES = "1000,100000,10000000"
+
+# Escribir y leer CSV de decenas de millones de filas tarda minutos; por encima de este tamaño se omite
+MAX_CSV_BARS = 1_000_000
+
+
+# Historial sintético en barras de un minuto (para que 10M de barras tengan fechas válidas)
+# con algunos valores NA para que la limpieza tenga trabajo
+def _make_history(bars):
+    data = synthetic_ohlcv(bars, drift=0.0, volatility=0.001, seed=bars, freq="min")
+    data.iloc[::1000, 3] = np.nan
+    return data
+
+
+# Guarda el historial en los formatos que lee FileProvider (un ticker por formato).
+# Devuelve un diccionario formato -> ticker; el almacén mapeado en memoria va al final.
+def _write_fixtures(root, data):
+    fixtures = {}
+    if len(data) <= MAX_CSV_BARS:
+        data.to_csv(os.path.join(root, "SINT_CSV.csv"))
+        fixtures["csv"] = "SINT_CSV"
+    data.to_parquet(os.path.join(root, "SINT_PQ.parquet"))
+    fixtures["parquet"] = "SINT_PQ"
+    OHLCVStore(root).write("SINT_MM", data)
+    fixtures["almacen"] = "SINT_MM"
+    return fixtures
+
+
+# Mejor tiempo de `repeat` ejecuciones de una función y pico de memoria de una ejecución adicional
+# (tracemalloc vuelve más lentas las asignaciones, así que no se activa mientras se mide el tiempo)
+def _measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def _bench_size(bars, repeat):
+    results = []
+
+    def record(stage, func, runs=repeat):
+        seconds, peak, value = _measure(func, runs)
+        results.append({"bars": bars, "stage": stage, "seconds": seconds,
+                        "bars_per_second": bars / seconds if seconds > 0 else float("inf"),
+                        "peak_mb": peak / 1e6})
+        return value
+
+    with tempfile.TemporaryDirectory() as root:
+        history = _make_history(bars)
+        fixtures = _write_fixtures(root, history)
+        del history
+
+        # Carga desde cada fuente local; la última (almacén mapeado en memoria) alimenta el resto
+        provider = FileProvider(root)
+        data = None
+        for source, ticker in fixtures.items():
+            data = record(f"carga_{source}", lambda: provider.history(ticker))
+
+        data = record("limpieza", lambda: _drop_na(data, []))
+
+        # Tendencia cuya cronología coincide con la serie, para medir el cálculo y no el mensaje de error
+        trend = "Alcista" if data['High'].to_numpy().argmax() > data['Low'].to_numpy().argmin() else "Bajista"
+        fib_data, _ = record("niveles", lambda: calculate_fibonacci_levels(data, trend))
+        chart_data, _ = record("reduccion", lambda: downsample_ohlc(data, DEFAULT_MAX_CANDLES))
+        fig = record("figura", lambda: build_fibonacci_figure(chart_data, fib_data, "SINT", trend,
+                                                              show_volume=True, extended_levels=True))
+        record("lineas", lambda: build_fibonacci_figure(chart_data.iloc[:2], fib_data, "SINT", trend,
+                                                        extended_levels=True))
+        record("serializacion", lambda: fig.to_json())
+
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+# Última medición guardada de un commit distinto al actual: (bars, stage) -> registro
+def _load_baseline(path, commit):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    previous = [r for r in records if r["commit"] != commit]
+    if not previous:
+        return {}
+    baseline_commit = previous[-1]["commit"]
+    return {(r["bars"], r["stage"]): r for r in previous if r["commit"] == baseline_commit}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del flujo carga -> niveles -> gráfico")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Tamaños de historial separados por comas")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por medición (se reporta la mejor)")
+    parser.add_argument("--save", help="Archivo JSON Lines donde se agregan los resultados")
+    parser.add_argument("--compare", action="store_true", help="Comparar contra la última medición guardada")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Empeoramiento relativo que se marca como regresión (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    baseline = _load_baseline(args.save, commit) if args.compare and args.save else {}
+
+    print(f"{'barras':>10} {'etapa':<15} {'segundos':>10} {'barras/s':>14} {'pico MB':>9}  cambio")
+    results, regressions = [], 0
+    for bars in (int(size) for size in args.sizes.split(",")):
+        for result in _bench_size(bars, args.repeat):
+            change = ""
+            previous = baseline.get((result["bars"], result["stage"]))
+            if previous:
+                ratio = result["seconds"] / previous["seconds"] - 1
+                change = f"{ratio*100:+.0f}% vs {previous['commit']}"
+                if ratio > args.tolerance:
+                    change += "  REGRESIÓN"
+                    regressions += 1
+            print(f"{result['bars']:>10} {result['stage']:<15} {result['seconds']:10.4f} "
+                  f"{result['bars_per_second']:14,.0f} {result['peak_mb']:9.1f}  {change}")
+            results.append(result)
+
+    if args.save:
+        timestamp = datetime.now().isoformat(timespec="seconds")
+        with open(args.save, "a", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps({"commit": commit, "date": timestamp, **result}) + "\n")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
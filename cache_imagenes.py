@@ -0,0 +1,110 @@
+import functools
+import hashlib
+import inspect
+import io
+import os
+import threading
+from importlib import metadata
+
+# Carpeta de imágenes precalculadas (se puede cambiar con la variable de entorno FIBONACCI_RENDER_DIR)
+DEFAULT_RENDER_DIR = os.environ.get(
+    "FIBONACCI_RENDER_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "fibonacci", "renders")
+)
+
+# Caché en memoria compartida por todas las sesiones del proceso: clave -> bytes de la imagen
+_memory_cache = {}
+_lock = threading.Lock()
+
+# Funciones registradas con @cached_render (para precalentar la caché)
+_registry = []
+
+
+# La versión de matplotlib forma parte de la clave: una actualización puede cambiar el dibujo
+@functools.lru_cache(maxsize=None)
+def _renderer_version():
+    try:
+        return metadata.version("matplotlib")
+    except metadata.PackageNotFoundError:
+        return "desconocida"
+
+
+# Clave de contenido: nombre y código fuente de la función, sus parámetros y la versión del renderizador.
+# Si se edita el código de una figura, su clave cambia y la imagen se vuelve a generar.
+def render_key(func, source_hash, args, kwargs):
+    payload = repr((func.__module__, func.__qualname__, source_hash, args,
+                    sorted(kwargs.items()), _renderer_version()))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_disk(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_disk(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Sin permisos de escritura la caché sigue funcionando en memoria
+        pass
+
+
+# Decorador para funciones deterministas que devuelven un buffer con una imagen (PNG o SVG).
+# La imagen se genera una sola vez por combinación de parámetros: primero se busca en memoria,
+# después en disco y solo si no existe se dibuja. Devuelve siempre un BytesIO nuevo.
+def cached_render(func=None, *, extension="png"):
+    if func is None:
+        return functools.partial(cached_render, extension=extension)
+
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = func.__code__.co_code.hex()
+    source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = render_key(func, source_hash, args, kwargs)
+        data = _memory_cache.get(key)
+        if data is None:
+            path = os.path.join(DEFAULT_RENDER_DIR, f"{func.__name__}-{key[:16]}.{extension}")
+            data = _read_disk(path)
+            if data is None:
+                with _lock:  # matplotlib (pyplot) no es seguro entre hilos
+                    data = _memory_cache.get(key)
+                    if data is None:
+                        data = func(*args, **kwargs).getvalue()
+                        _write_disk(path, data)
+            _memory_cache[key] = data
+        return io.BytesIO(data)
+
+    wrapper.uncached = func
+    _registry.append(wrapper)
+    return wrapper
+
+
+# Genera (si faltan) las imágenes de todas las funciones registradas sin parámetros.
+# Útil al construir la imagen del contenedor para que ningún visitante pague el dibujo.
+def prewarm():
+    for render in _registry:
+        render()
+    return len(_registry)
+
+
+if __name__ == "__main__":
+    # Precalentar la caché en disco: python cache_imagenes.py
+    # Se importa el módulo por su nombre para usar el mismo registro que las figuras
+    import cache_imagenes
+    import ejemplos_fibonacci  # Registra las figuras de la página de ejemplos
+    import figuras_fibonacci  # Registra las espirales de app.py
+
+    count = cache_imagenes.prewarm()
+    print(f"{count} imágenes listas en {cache_imagenes.DEFAULT_RENDER_DIR}")
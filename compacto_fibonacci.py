@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Representación compacta de los historiales en caché (variable FIBONACCI_COMPACT_CACHE=1; sin ella
+# la caché guarda el DataFrame completo)
+COMPACT_HISTORIES = os.environ.get("FIBONACCI_COMPACT_CACHE", "") not in ("", "0")
+
+# Columnas que usa la aplicación; las demás de yfinance (Dividends, Stock Splits) se descartan
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+COMPACT_COLUMNS = PRICE_COLUMNS + ("Volume",)
+
+# Error máximo permitido al guardar precios en float32 (medio centavo). Si algún precio lo supera
+# (por ejemplo, acciones de cientos de miles de dólares) se conservan en float64.
+DEFAULT_PRICE_TOLERANCE = 0.005
+
+# Unidades posibles de los desplazamientos del índice, de la más gruesa a la más fina, y cuántas caben en un día
+OFFSET_UNITS = (("D", 1), ("m", 1440), ("s", 86400))
+
+INT32_MAX = np.iinfo(np.int32).max
+UINT32_MAX = np.iinfo(np.uint32).max
+
+
+# Historial OHLCV compacto: cada columna es un arreglo de NumPy (precios en float32 cuando la precisión
+# alcanza, volumen en uint32 cuando cabe) y las fechas son desplazamientos int32 desde la medianoche del primer día,
+# en días para datos diarios o en minutos/segundos para intradía. Ocupa menos del 40% de un DataFrame
+# de yfinance con índice de fechas (ver benchmarks/bench_memoria.py) y se serializa sin objetos de pandas.
+class CompactHistory:
+    __slots__ = ("origin", "unit", "offsets", "columns")
+
+    def __init__(self, origin, unit, offsets, columns):
+        self.origin = origin
+        self.unit = unit
+        self.offsets = offsets
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # Rebanada por posición (vistas, sin copiar los arreglos)
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("CompactHistory solo admite rebanadas")
+        return CompactHistory(self.origin, self.unit, self.offsets[key],
+                              {name: values[key] for name, values in self.columns.items()})
+
+    @property
+    def index(self):
+        steps = self.offsets.astype(np.int64) * np.timedelta64(1, self.unit)
+        return pd.DatetimeIndex(self.origin + steps, name="Date")
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    # Mismo criterio que slice_period: últimas `days` barras en diario o todas las barras de las
+    # últimas `days` sesiones en intradía (days == 0: todo)
+    def period(self, days, interval="1d"):
+        if days <= 0:
+            return self
+        if interval == "1d":
+            return self[-days:]
+
+        per_day = dict(OFFSET_UNITS)[self.unit]
+        sessions = np.unique(self.offsets // per_day)
+        if len(sessions) <= days:
+            return self
+        start = np.searchsorted(self.offsets, sessions[-days] * per_day, side="left")
+        return self[start:]
+
+    # DataFrame con índice de fechas y columnas float64, como el que devuelve fetch_full_history
+    def to_frame(self):
+        return pd.DataFrame({name: values.astype(np.float64) for name, values in self.columns.items()},
+                            index=self.index)
+
+
+# Primera unidad (día, minuto o segundo) que representa exactamente todas las fechas en int32
+def _compact_offsets(index):
+    origin = index[0].normalize().to_datetime64()
+    delta = (index.values - origin).astype("timedelta64[ns]")
+    for unit, _ in OFFSET_UNITS:
+        step = np.timedelta64(1, unit).astype("timedelta64[ns]")
+        offsets = delta // step
+        if (offsets * step == delta).all() and offsets.max() <= INT32_MAX:
+            return origin, unit, offsets.astype(np.int32)
+    return None
+
+
+# Convierte un historial a CompactHistory. Devuelve (compact, error); el error explica por qué
+# no se pudo compactar (por ejemplo, fechas con fracciones de segundo), y entonces compact es None.
+def compact_history(data, tolerance=DEFAULT_PRICE_TOLERANCE):
+    if data is None or data.empty:
+        return None, "No hay datos para compactar."
+    missing = [name for name in PRICE_COLUMNS if name not in data.columns]
+    if missing:
+        return None, f"Faltan columnas: {', '.join(missing)}"
+    if not data.index.is_monotonic_increasing:
+        return None, "El índice de fechas no está ordenado."
+
+    offsets = _compact_offsets(data.index)
+    if offsets is None:
+        return None, "Las fechas no se pueden representar como desplazamientos enteros."
+    origin, unit, offsets = offsets
+
+    # Comprobación de precisión: todas las columnas de precio comparten el mismo tipo
+    prices = {name: data[name].to_numpy(dtype=np.float64) for name in PRICE_COLUMNS}
+    error = max(float(np.nanmax(np.abs(values.astype(np.float32) - values), initial=0.0))
+                for values in prices.values())
+    price_dtype = np.float32 if error <= tolerance else np.float64
+
+    columns = {name: values.astype(price_dtype) for name, values in prices.items()}
+    if 'Volume' in data.columns:
+        columns['Volume'] = _compact_volume(data['Volume'].to_numpy(dtype=np.float64))
+    return CompactHistory(origin, unit, offsets, columns), None
+
+
+# Volumen sin pérdida: uint32 si son enteros que caben, float32 si se conserva exacto y si no float64
+def _compact_volume(volume):
+    if np.isfinite(volume).all() and (volume >= 0).all() and (volume == np.floor(volume)).all():
+        if volume.max(initial=0) <= UINT32_MAX:
+            return volume.astype(np.uint32)
+        return volume.astype(np.int64)
+    as_float32 = volume.astype(np.float32)
+    if np.array_equal(as_float32, volume, equal_nan=True):
+        return as_float32
+    return volume
+
+
+# Resultado de niveles con __slots__ en lugar del diccionario fib_data. Se lee igual que el diccionario
+# (fib_data['levels'], 'confirmed' in fib_data), así que sirve en todos los lugares que lo reciben.
+# Los campos que el resultado original no tenía quedan sin asignar.
+class LevelsRecord:
+    __slots__ = ("levels", "min_price", "max_price", "min_idx", "max_idx", "trend_type", "confirmed")
+
+    @classmethod
+    def from_dict(cls, fib_data):
+        record = cls()
+        for key, value in fib_data.items():
+            setattr(record, key, value)
+        return record
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return [key for key in self.__slots__ if hasattr(self, key)]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.keys()}
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from niveles_fibonacci import fibonacci_levels_batch, RETRACEMENT_RATIOS
+
+# Distancia máxima (en proporción del precio) entre niveles de una misma zona
+DEFAULT_ZONE_TOLERANCE = 0.005
+
+# Los niveles clave pesan más en la fuerza de una zona
+KEY_RATIOS = (0.382, 0.5, 0.618)
+
+
+# Mínimo acumulado desde el final de la serie y su posición (primera aparición cronológica).
+# running[k] es el mínimo de las últimas k+1 barras; positions[k] su posición en la serie original.
+def _suffix_min(values):
+    reversed_values = values[::-1]
+    running = np.minimum.accumulate(reversed_values)
+    steps = np.arange(len(values))
+    markers = np.where(reversed_values == running, steps, 0)
+    last_match = np.maximum.accumulate(markers)
+    return running, len(values) - 1 - last_match
+
+
+# Extremos de todas las ventanas finales (últimas `days` barras) en una sola pasada.
+# Devuelve arreglos alineados con `windows`: mínimo, máximo y sus posiciones.
+def window_extremes(data, windows):
+    lows = data['Low'].to_numpy(dtype=np.float64)
+    highs = data['High'].to_numpy(dtype=np.float64)
+    n = len(lows)
+
+    min_running, min_positions = _suffix_min(lows)
+    max_running, max_positions = _suffix_min(-highs)
+
+    # days == 0 (o mayor que el historial) significa todo el historial
+    steps = np.array([n if days <= 0 or days > n else days for days in windows]) - 1
+    return min_running[steps], -max_running[steps], min_positions[steps], max_positions[steps]
+
+
+# Niveles de Fibonacci de cada período calculados a partir de un único historial.
+#   periods: diccionario nombre -> número de barras (como period_options)
+# Devuelve un DataFrame con una fila por período y nivel; los períodos cuya cronología
+# no coincide con la tendencia se omiten (misma regla que calculate_fibonacci_levels).
+def multi_timeframe_levels(data, periods, trend_type, ratios=RETRACEMENT_RATIOS):
+    names = list(periods.keys())
+    windows = list(periods.values())
+    min_prices, max_prices, min_pos, max_pos = window_extremes(data, windows)
+
+    if trend_type == "Alcista":
+        valid = max_pos >= min_pos
+    else:
+        valid = min_pos >= max_pos
+
+    levels = fibonacci_levels_batch(np.column_stack([min_prices, max_prices]), ratios, trend_type)
+
+    ratios = np.asarray(ratios, dtype=np.float64)
+    rows = np.flatnonzero(valid)
+    return pd.DataFrame({
+        'period': np.repeat(np.asarray(names, dtype=object)[rows], len(ratios)),
+        'ratio': np.tile(ratios, len(rows)),
+        'price': levels[rows].ravel(),
+        'min_date': np.repeat(data.index[min_pos[rows]], len(ratios)),
+        'max_date': np.repeat(data.index[max_pos[rows]], len(ratios)),
+    })
+
+
+# Agrupa los niveles de todos los períodos en zonas de confluencia.
+# Dos niveles consecutivos (ordenados por precio) pertenecen a la misma zona si su distancia
+# es menor que `tolerance` del precio. La fuerza suma 1 por cada nivel clave (38.2/50/61.8%)
+# y 0.5 por los demás, y se multiplica por el número de períodos distintos que coinciden.
+def confluence_zones(levels, tolerance=DEFAULT_ZONE_TOLERANCE):
+    if levels.empty:
+        return pd.DataFrame(columns=['zone_low', 'zone_high', 'center', 'levels', 'timeframes',
+                                     'periods', 'ratios', 'strength'])
+
+    levels = levels.sort_values('price').reset_index(drop=True)
+    prices = levels['price'].to_numpy(dtype=np.float64)
+    gaps = np.diff(prices) / np.maximum(np.abs(prices[:-1]), np.finfo(float).eps)
+    levels['zone'] = np.concatenate([[0], np.cumsum(gaps > tolerance)])
+    levels['weight'] = np.where(np.isin(np.round(levels['ratio'], 3), KEY_RATIOS), 1.0, 0.5)
+
+    grouped = levels.groupby('zone', sort=True)
+    zones = pd.DataFrame({
+        'zone_low': grouped['price'].min(),
+        'zone_high': grouped['price'].max(),
+        'center': grouped['price'].mean(),
+        'levels': grouped.size(),
+        'timeframes': grouped['period'].nunique(),
+        'weight': grouped['weight'].sum(),
+        'periods': grouped['period'].agg(lambda p: ", ".join(dict.fromkeys(p))),
+        'ratios': grouped['ratio'].agg(lambda r: ", ".join(f"{v*100:.1f}%" for v in sorted(set(r)))),
+    })
+    zones['strength'] = zones['weight'] * zones['timeframes']
+    zones = zones.drop(columns=['weight'])
+    return zones.sort_values(['strength', 'center'], ascending=[False, True]).reset_index(drop=True)
@@ -0,0 +1,364 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from proveedores_fibonacci import get_provider
+
+# Número máximo de descargas simultáneas para listas de tickers
+DEFAULT_MAX_WORKERS = 8
+
+# Tiempo durante el cual un historial almacenado se considera actualizado (sin consultar a Yahoo)
+REFRESH_INTERVAL = timedelta(hours=1)
+
+# Tiempo durante el cual las barras nuevas del modo en vivo se comparten entre sesiones
+LIVE_POLL_INTERVAL = timedelta(seconds=2)
+
+# Intervalos disponibles. Para los intradía Yahoo solo conserva cierta historia (lookback) y
+# limita el rango de cada petición (chunk), así que la descarga se divide en bloques.
+INTERVALS = {
+    "1d": {"label": "Diario", "lookback": None, "chunk": None, "refresh": REFRESH_INTERVAL},
+    "1h": {"label": "1 hora", "lookback": timedelta(days=729), "chunk": timedelta(days=180),
+           "refresh": timedelta(minutes=30)},
+    "15m": {"label": "15 minutos", "lookback": timedelta(days=59), "chunk": timedelta(days=20),
+            "refresh": timedelta(minutes=10)},
+    "5m": {"label": "5 minutos", "lookback": timedelta(days=59), "chunk": timedelta(days=20),
+           "refresh": timedelta(minutes=5)},
+    "1m": {"label": "1 minuto", "lookback": timedelta(days=29), "chunk": timedelta(days=7),
+           "refresh": timedelta(minutes=1)},
+}
+
+
+# Obtiene barras del proveedor (todo el historial diario si start es None).
+# Sin proveedor explícito se usa el configurado en FIBONACCI_PROVIDER (Yahoo por defecto).
+def _download(ticker, start=None, end=None, interval="1d", provider=None):
+    provider = provider or get_provider()
+    return provider.history(ticker, start=start, end=end, interval=interval)
+
+
+# Elimina valores nulos y agrega el aviso correspondiente
+def _drop_na(data, notices):
+    na_count = data.isna().sum().sum()
+    if na_count > 0:
+        notices.append(f"Se encontraron {na_count} valores NA en los datos. Se eliminarán automáticamente.")
+        data = data.dropna()
+    return data
+
+
+# Actualiza el almacén local de un ticker y devuelve su historial completo.
+# Solo se descargan las barras posteriores a la última fecha guardada; si el almacén se
+# revisó hace menos de REFRESH_INTERVAL no se hace ninguna consulta.
+def _refresh_store(store, ticker, notices, provider=None):
+    meta = store.read_meta(ticker)
+
+    # Almacén vacío (o con un historial parcial antiguo): descarga completa una sola vez
+    if not meta or meta["rows"] == 0 or meta.get("coverage_start") is not None:
+        data = _drop_na(_download(ticker, provider=provider), notices)
+        if not data.empty:
+            store.write(ticker, data)
+        return store.read(ticker)
+
+    fetched_at = pd.Timestamp(meta["fetched_at"]) if meta.get("fetched_at") else None
+    if fetched_at is None or datetime.now() - fetched_at > REFRESH_INTERVAL:
+        # Se vuelve a pedir desde la última fecha para actualizar la barra de la sesión en curso
+        last = store.last_timestamp(ticker)
+        new_data = _drop_na(_download(ticker, last.normalize(), provider=provider), notices)
+        if new_data.empty:
+            store.touch(ticker)
+        else:
+            store.append(ticker, new_data)
+
+    return store.read(ticker)
+
+
+# Clave del almacén: el historial diario usa el ticker tal cual; los intradía uno propio por intervalo
+def _store_key(ticker, interval):
+    return ticker if interval == "1d" else f"{ticker}@{interval}"
+
+
+# Divide [start, end) en bloques del tamaño permitido por Yahoo para el intervalo
+def _chunk_ranges(start, end, chunk):
+    ranges = []
+    while start < end:
+        ranges.append((start, min(start + chunk, end)))
+        start += chunk
+    return ranges
+
+
+# Descarga un rango intradía en bloques concurrentes. Los bloques se entregan en orden
+# cronológico (executor.map) y, si hay almacén, cada uno se guarda en cuanto llega:
+# una descarga interrumpida continúa después desde la última barra guardada.
+def _fetch_intraday(ticker, interval, start, end, notices, store=None, max_workers=DEFAULT_MAX_WORKERS,
+                    provider=None):
+    ranges = _chunk_ranges(start, end, INTERVALS[interval]["chunk"])
+    key = _store_key(ticker, interval)
+    frames = []
+
+    workers = max(1, min(max_workers, len(ranges)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(lambda r: _download(ticker, r[0], r[1], interval, provider), ranges)
+        for chunk in chunks:
+            chunk = _drop_na(chunk, notices)
+            chunk = chunk[~chunk.index.duplicated(keep="last")].sort_index()
+            if chunk.empty:
+                continue
+            if store is not None:
+                # Punto de control: el bloque queda guardado aunque los siguientes fallen
+                store.append(key, chunk, complete=False)
+            else:
+                frames.append(chunk)
+
+    if store is not None:
+        store.touch(key)
+        return store.read(key)
+    if not frames:
+        return None
+    data = pd.concat(frames)
+    return data[~data.index.duplicated(keep="last")]
+
+
+# Historial intradía con almacén: se reanuda desde la última barra guardada
+def _refresh_intraday_store(store, ticker, interval, notices, max_workers, provider=None):
+    settings = INTERVALS[interval]
+    key = _store_key(ticker, interval)
+    meta = store.read_meta(key)
+    now = datetime.now()
+
+    fetched_at = pd.Timestamp(meta["fetched_at"]) if meta and meta.get("fetched_at") else None
+    if fetched_at is not None and now - fetched_at <= settings["refresh"]:
+        return store.read(key)
+
+    earliest = now - settings["lookback"]
+    last = store.last_timestamp(key) if meta and meta["rows"] > 0 else None
+    start = earliest if last is None or last < earliest else last.to_pydatetime()
+    return _fetch_intraday(ticker, interval, start, now + timedelta(days=1), notices,
+                           store=store, max_workers=max_workers, provider=provider)
+
+
+# Descargas en curso en este proceso: clave -> Future con el resultado
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+# Última consulta de barras nuevas por (ticker, intervalo, proveedor): (momento, since, barras)
+_recent_bars = {}
+
+
+# Ejecuta func una sola vez por clave a la vez: si otro hilo (otra sesión) ya está obteniendo
+# el mismo ticker, se espera su resultado en lugar de lanzar una segunda consulta.
+def _coalesced(key, func):
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        owner = future is None
+        if owner:
+            future = _in_flight[key] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        result = func()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+
+
+# Historial de un proveedor remoto. Con almacén, la actualización se hace bajo el candado del ticker:
+# si otro proceso ya lo está descargando, se espera y después se lee lo que guardó (su fecha de
+# revisión reciente evita una segunda consulta). Devuelve (data, avisos).
+def _load_remote(ticker, interval, store, max_workers, provider):
+    notices = []
+    if store is not None:
+        with store.lock(_store_key(ticker, interval)):
+            if interval != "1d":
+                data = _refresh_intraday_store(store, ticker, interval, notices, max_workers, provider)
+            else:
+                data = _refresh_store(store, ticker, notices, provider)
+        store.evict()
+    elif interval != "1d":
+        now = datetime.now()
+        data = _fetch_intraday(ticker, interval, now - INTERVALS[interval]["lookback"],
+                               now + timedelta(days=1), notices, max_workers=max_workers, provider=provider)
+    else:
+        data = _drop_na(_download(ticker, provider=provider), notices)
+    return data, notices
+
+
+# Obtiene el historial más largo disponible de un ticker para el intervalo indicado. Este historial
+# se guarda una sola vez por ticker e intervalo y todos los períodos se sirven a partir de él con
+# slice_period. Si se recibe un almacén (OHLCVStore), se usa como caché persistente con
+# actualización incremental (y, en intradía, descarga reanudable por bloques) compartida entre
+# procesos; las consultas simultáneas al mismo ticker se agrupan en una sola descarga.
+# Los proveedores locales (archivos, datos sintéticos) se leen directamente, sin almacén ni bloques.
+# Devuelve (data, error, avisos) donde avisos es una lista de mensajes para mostrar al usuario.
+def fetch_full_history(ticker, store=None, interval="1d", max_workers=DEFAULT_MAX_WORKERS, provider=None):
+    notices = []
+
+    try:
+        if interval not in INTERVALS:
+            return None, f"Intervalo no soportado: {interval}", notices
+
+        provider = provider or get_provider()
+        if not provider.remote:
+            data = _drop_na(provider.history(ticker, interval=interval), notices)
+        else:
+            key = (store.root if store is not None else None, _store_key(ticker, interval), provider.name)
+            data, shared_notices = _coalesced(
+                key, lambda: _load_remote(ticker, interval, store, max_workers, provider)
+            )
+            notices.extend(shared_notices)
+
+        if data is None or data.empty:
+            return None, "No se encontraron datos para el ticker seleccionado.", notices
+
+        # Verificar que tenemos suficientes datos
+        if len(data) < 30:
+            notices.append("ADVERTENCIA: Pocos datos disponibles. Los resultados pueden no ser confiables.")
+
+        return data, None, notices
+    except Exception as e:
+        return None, f"Error al cargar datos: {str(e)}", notices
+
+
+# Últimas barras de un ticker lo antes posible (para el encabezado del análisis): desde el almacén si
+# ya está al día o con una consulta corta de los últimos días, sin esperar el historial completo.
+# Devuelve (data, error).
+def fetch_latest_bars(ticker, store=None, interval="1d", provider=None, bars=2):
+    try:
+        provider = provider or get_provider()
+        if store is not None and provider.remote:
+            key = _store_key(ticker, interval)
+            meta = store.read_meta(key)
+            fetched_at = pd.Timestamp(meta["fetched_at"]) if meta and meta.get("fetched_at") else None
+            if fetched_at is not None and datetime.now() - fetched_at <= INTERVALS[interval]["refresh"]:
+                data = store.read(key)
+                if data is not None:
+                    return data.iloc[-bars:], None
+
+        recent = timedelta(days=10) if interval == "1d" else timedelta(days=5)
+        data = _drop_na(provider.history(ticker, start=datetime.now() - recent, interval=interval), [])
+        if data is None or data.empty:
+            return None, "No se encontraron datos para el ticker seleccionado."
+        return data.iloc[-bars:], None
+    except Exception as e:
+        return None, f"Error al cargar datos: {str(e)}"
+
+
+# Barras desde `since` (incluida, para recibir la versión más reciente de la vela en curso) para el
+# modo en vivo. Todas las sesiones que siguen el mismo ticker comparten las consultas: las simultáneas
+# se agrupan con _coalesced y una respuesta se reutiliza durante LIVE_POLL_INTERVAL para cualquier
+# `since` igual o posterior al suyo. Devuelve (data, error).
+def fetch_new_bars(ticker, since, interval="1d", provider=None):
+    try:
+        provider = provider or get_provider()
+        since = pd.Timestamp(since)
+        key = (ticker, interval, provider.name)
+        recent = _recent_bars.get(key)
+        if recent is not None and time.monotonic() - recent[0] <= LIVE_POLL_INTERVAL.total_seconds() \
+                and recent[1] <= since:
+            data = recent[2]
+        else:
+            data = _coalesced(("nuevas",) + key + (since,),
+                              lambda: _drop_na(provider.history(ticker, start=since, interval=interval), []))
+            now = time.monotonic()
+            # Las respuestas vencidas ya no se reutilizan: se descartan para no retener sus barras
+            for expired in [k for k, (fetched, _, _) in _recent_bars.items()
+                            if now - fetched > LIVE_POLL_INTERVAL.total_seconds()]:
+                _recent_bars.pop(expired, None)
+            _recent_bars[key] = (now, since, data)
+        return data.iloc[data.index.searchsorted(since, side="left"):], None
+    except Exception as e:
+        return None, f"Error al cargar datos: {str(e)}"
+
+
+# Carga el historial completo solo para actualizar el almacén y devuelve el error (None si terminó bien).
+# El DataFrame se descarta para que la precarga no lo mantenga en memoria junto a la caché de la aplicación.
+def _warm_full_history(ticker, store=None, interval="1d", provider=None):
+    _, error, _ = fetch_full_history(ticker, store, interval, provider=provider)
+    return error
+
+
+# Cargas en segundo plano que empiezan en cuanto cambia el ticker, antes de hacer clic en "Analizar".
+# Como fetch_full_history agrupa las consultas simultáneas, la carga normal que llegue después
+# espera la misma descarga en lugar de repetirla (o lee el almacén ya actualizado).
+# Una carga terminada se reutiliza durante `max_age`; después se descarta del registro.
+class BackgroundLoader:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_age=timedelta(minutes=1)):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="precarga")
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.max_age = max_age.total_seconds()
+
+    def _submit(self, key, func, *args, **kwargs):
+        now = time.monotonic()
+        with self._lock:
+            # Olvidar las cargas terminadas que ya vencieron (y con ellas sus resultados)
+            expired = [k for k, (future, submitted) in self._futures.items()
+                       if future.done() and now - submitted > self.max_age]
+            for k in expired:
+                del self._futures[k]
+
+            future, _ = self._futures.get(key, (None, 0.0))
+            if future is None:
+                future = self._executor.submit(func, *args, **kwargs)
+                self._futures[key] = (future, now)
+            return future
+
+    # Inicia (si no está en curso) la carga de las últimas barras y del historial completo.
+    # Devuelve dos Future: (data, error) de fetch_latest_bars y el error (o None) de la carga del historial,
+    # que solo avisa cuándo terminó; el historial se obtiene después con fetch_full_history.
+    # Los proveedores locales no tienen almacén que preparar: su Future ya está terminado.
+    def prefetch(self, ticker, interval="1d", store=None, provider=None):
+        provider = provider or get_provider()
+        latest = self._submit(("ultimas", ticker, interval), fetch_latest_bars, ticker, store, interval, provider)
+        if provider.remote and store is not None:
+            full = self._submit(("historial", ticker, interval), _warm_full_history, ticker, store, interval,
+                                provider=provider)
+        else:
+            full = Future()
+            full.set_result(None)
+        return latest, full
+
+
+# Últimos `days` días de mercado del historial como vista (sin copiar datos); days == 0 significa
+# todo el historial. En intradía se toman todas las barras de las últimas `days` sesiones.
+def slice_period(data, days, interval="1d"):
+    if days <= 0:
+        return data
+    if interval == "1d":
+        return data.iloc[-days:]
+
+    sessions = data.index.normalize().unique()
+    if len(sessions) <= days:
+        return data
+    start = data.index.searchsorted(sessions[-days], side="left")
+    return data.iloc[start:]
+
+
+# Descarga y limpia el historial de un ticker, limitado al período solicitado.
+# Devuelve (data, error, avisos) igual que fetch_full_history.
+def fetch_history(ticker, days, store=None, interval="1d", provider=None):
+    data, error, notices = fetch_full_history(ticker, store=store, interval=interval, provider=provider)
+    if error:
+        return None, error, notices
+    return slice_period(data, days, interval), None, notices
+
+
+# Descarga los historiales de varios tickers en paralelo con un grupo acotado de hilos.
+# Devuelve un diccionario ticker -> (data, error) en el mismo orden de la lista recibida.
+def fetch_histories(tickers, days, max_workers=DEFAULT_MAX_WORKERS, store=None, provider=None):
+    tickers = list(dict.fromkeys(tickers))  # Quitar duplicados conservando el orden
+    if not tickers:
+        return {}
+
+    workers = max(1, min(max_workers, len(tickers)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda t: fetch_history(t, days, store=store, provider=provider), tickers))
+
+    return {ticker: (data, error) for ticker, (data, error, _) in zip(tickers, results)}
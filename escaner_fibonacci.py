@@ -0,0 +1,57 @@
+import re
+
+import pandas as pd
+
+from niveles_fibonacci import calculate_fibonacci_levels
+
+# Niveles clave que revisa el escáner
+SCAN_RATIOS = (0.382, 0.5, 0.618)
+
+
+# Convierte el texto capturado por el usuario (comas, espacios o saltos de línea) en una lista de tickers
+def parse_tickers(text):
+    tickers = [t.strip().upper() for t in re.split(r"[\s,;]+", text or "")]
+    return list(dict.fromkeys(t for t in tickers if t))
+
+
+# Calcula, para cada ticker, qué tan cerca está el precio actual de los niveles 38.2/50/61.8%.
+#   histories: diccionario ticker -> (data, error) como el que devuelve fetch_histories
+# Devuelve (tabla ordenada por cercanía, diccionario ticker -> error)
+def scan_watchlist(histories, trend_type, ratios=SCAN_RATIOS):
+    rows = []
+    errors = {}
+
+    for ticker, (data, error) in histories.items():
+        if error:
+            errors[ticker] = error
+            continue
+
+        fib_data, fib_error = calculate_fibonacci_levels(data, trend_type)
+        if fib_error:
+            errors[ticker] = fib_error
+            continue
+
+        precio_actual = float(data['Close'].iloc[-1])
+        row = {"Ticker": ticker, "Precio Actual": precio_actual}
+
+        closest_ratio = None
+        closest_distance = None
+        for ratio in ratios:
+            level_price = float(fib_data['levels'][ratio])
+            # Distancia con signo, en % del precio actual (positiva = el precio está por encima del nivel)
+            distance = (precio_actual - level_price) / precio_actual * 100
+            row[f"Nivel {ratio*100:.1f}%"] = level_price
+            row[f"Dist. {ratio*100:.1f}% (%)"] = distance
+            if closest_distance is None or abs(distance) < abs(closest_distance):
+                closest_ratio = ratio
+                closest_distance = distance
+
+        row["Nivel más cercano"] = f"{closest_ratio*100:.1f}%"
+        row["Distancia mínima (%)"] = abs(closest_distance)
+        rows.append(row)
+
+    table = pd.DataFrame(rows)
+    if not table.empty:
+        table = table.sort_values("Distancia mínima (%)").reset_index(drop=True)
+
+    return table, errors
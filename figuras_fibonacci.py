@@ -0,0 +1,63 @@
+import io
+
+import numpy as np
+
+from cache_imagenes import cached_render
+
+# Figuras estáticas de app.py. Se generan una sola vez por proceso (y se guardan en disco),
+# así que una interacción con cualquier widget ya no vuelve a dibujarlas.
+# matplotlib se importa dentro de cada función: con la caché caliente ni siquiera se carga.
+
+
+# Espiral de Fibonacci de la sección "Fundamentos Teóricos"
+@cached_render
+def create_fibonacci_spiral():
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+
+    # Generar secuencia Fibonacci
+    fib = [0, 1]
+    for i in range(2, 12):
+        fib.append(fib[i-1] + fib[i-2])
+
+    # Crear espiral
+    phi = (1 + 5**0.5) / 2
+    theta = np.linspace(0, 8 * np.pi, 1000)
+    r = phi ** (theta / (np.pi/2))
+
+    ax.plot(r * np.cos(theta), r * np.sin(theta), color='blue')
+    ax.set_title('Espiral de Fibonacci')
+    ax.axis('equal')
+    ax.grid(True)
+    ax.set_axis_off()
+
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png')
+    buf.seek(0)
+    plt.close(fig)
+    return buf
+
+
+# Espiral simple de la página de ejemplos básicos (respaldo)
+@cached_render
+def create_simple_spiral():
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+    theta = np.linspace(0, 8 * np.pi, 1000)
+    a = 0.15
+    r = a * np.exp(theta * 0.3)
+    x = r * np.cos(theta)
+    y = r * np.sin(theta)
+    ax.plot(x, y, 'b-')
+    ax.set_title("Espiral inspirada en Fibonacci")
+    ax.set_aspect('equal')
+    ax.grid(True, alpha=0.3)
+    ax.set_axis_off()
+
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png')
+    buf.seek(0)
+    plt.close(fig)
+    return buf
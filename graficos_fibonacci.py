@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+
+# Número de velas que se envían al navegador por defecto
+DEFAULT_MAX_CANDLES = 1000
+
+
+# Reduce un historial OHLC a como máximo `max_candles` velas agrupando barras consecutivas.
+# Cada grupo conserva su apertura (primera), máximo, mínimo y cierre (último), y el volumen se suma,
+# así que los extremos del período (y los puntos de giro) nunca se pierden.
+# Devuelve (datos reducidos, barras por vela); con max_candles <= 0 no se reduce nada.
+def downsample_ohlc(data, max_candles=DEFAULT_MAX_CANDLES):
+    n = len(data)
+    if max_candles <= 0 or n <= max_candles:
+        return data, 1
+
+    bucket_size = int(np.ceil(n / max_candles))
+    starts = np.arange(0, n, bucket_size)
+    ends = np.append(starts[1:], n) - 1
+
+    columns = {
+        'Open': data['Open'].to_numpy(dtype=np.float64)[starts],
+        'High': np.maximum.reduceat(data['High'].to_numpy(dtype=np.float64), starts),
+        'Low': np.minimum.reduceat(data['Low'].to_numpy(dtype=np.float64), starts),
+        'Close': data['Close'].to_numpy(dtype=np.float64)[ends],
+    }
+    if 'Volume' in data.columns:
+        columns['Volume'] = np.add.reduceat(data['Volume'].to_numpy(), starts)
+
+    return pd.DataFrame(columns, index=data.index[starts]), bucket_size
+
+
+# Fechas como milisegundos desde 1970 en float64: Plotly las interpreta en un eje de tipo fecha
+# y las serializa como arreglo binario (base64) en lugar de una lista de cadenas.
+def _dates_to_ms(values):
+    return np.asarray(values, dtype="datetime64[ns]").astype("datetime64[ms]").astype(np.float64)
+
+
+# Nombre de la línea (y su anotación) de cada nivel, para poder moverla después sin reconstruir la figura
+def _level_name(ratio):
+    return f"nivel_{ratio:.3f}"
+
+
+def _level_text(ratio, price):
+    return f"Retroceso {ratio*100:.1f}%: ${price:.2f}"
+
+
+# Construye el gráfico de velas con los niveles de Fibonacci.
+# Los arreglos de NumPy se pasan directamente a Plotly (sin convertirlos a listas de Python),
+# de modo que el costo de construir y serializar la figura no depende de crear objetos por barra.
+def build_fibonacci_figure(chart_data, fib_data, ticker, trend_type, show_volume=False, extended_levels=False):
+    import plotly.graph_objects as go
+
+    from niveles_fibonacci import fibonacci_levels_batch, EXTENSION_RATIOS
+
+    fig = go.Figure()
+
+    # Preparar datos para el gráfico de velas
+    dates = _dates_to_ms(chart_data.index.values)
+    open_values = chart_data['Open'].to_numpy(dtype=np.float64)
+    high_values = chart_data['High'].to_numpy(dtype=np.float64)
+    low_values = chart_data['Low'].to_numpy(dtype=np.float64)
+    close_values = chart_data['Close'].to_numpy(dtype=np.float64)
+
+    # Agregar gráfico de velas
+    fig.add_trace(go.Candlestick(
+        x=dates,
+        open=open_values,
+        high=high_values,
+        low=low_values,
+        close=close_values,
+        name="Precio",
+        increasing_line_color='green',
+        decreasing_line_color='red'
+    ))
+
+    # Agregar líneas de retroceso de Fibonacci
+    colors = ['red', 'orange', 'gold', 'green', 'blue', 'purple', 'magenta']
+    levels = fib_data['levels']
+
+    for i, (ratio, price) in enumerate(levels.items()):
+        ratio_value = float(ratio)
+        price_value = float(price)
+
+        fig.add_hline(
+            y=price_value,
+            line_dash="dash",
+            line_color=colors[i % len(colors)],
+            name=_level_name(ratio_value),
+            annotation_text=_level_text(ratio_value, price_value),
+            annotation_position="right",
+            annotation_name=_level_name(ratio_value)
+        )
+
+    min_price_value = float(fib_data['min_price'])
+    max_price_value = float(fib_data['max_price'])
+
+    # Resaltar puntos extremos
+    fig.add_trace(go.Scatter(
+        x=_dates_to_ms([fib_data['min_idx'], fib_data['max_idx']]),
+        y=np.array([min_price_value, max_price_value]),
+        mode='markers',
+        marker=dict(size=12, color='red'),
+        name='Puntos Extremos'
+    ))
+
+    # Configurar gráfico
+    fig.update_layout(
+        title=f"Retrocesos de Fibonacci para {ticker} - Tendencia {trend_type}",
+        xaxis_title="Fecha",
+        yaxis_title="Precio",
+        height=600,
+        xaxis_rangeslider_visible=False,
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        plot_bgcolor='white',
+        xaxis=dict(type='date', showgrid=True, gridcolor='lightgray'),
+        yaxis=dict(showgrid=True, gridcolor='lightgray')
+    )
+
+    # Opcional: mostrar volumen si está activado
+    if show_volume:
+        # Máscara vectorizada: 1 = vela alcista (verde), 0 = vela bajista (rojo)
+        rising = (close_values > open_values).astype(np.int8)
+
+        fig.add_trace(go.Bar(
+            x=dates,
+            y=chart_data['Volume'].to_numpy(dtype=np.float64),
+            name="Volumen",
+            marker=dict(color=rising, colorscale=[[0, 'red'], [1, 'green']], cmin=0, cmax=1),
+            opacity=0.3,
+            yaxis="y2"
+        ))
+
+        fig.update_layout(
+            yaxis2=dict(
+                title="Volumen",
+                overlaying="y",
+                side="right",
+                showgrid=False
+            )
+        )
+
+    # Opcional: mostrar niveles de extensión si está activado
+    if extended_levels:
+        # Añadir niveles de extensión: 1.272 y 1.618
+        extension_prices = fibonacci_levels_batch(
+            [[min_price_value, max_price_value]], EXTENSION_RATIOS, trend_type
+        )[0]
+
+        # Añadir las líneas de extensión
+        for ratio, price in zip(EXTENSION_RATIOS.tolist(), extension_prices.tolist()):
+            fig.add_hline(
+                y=price,
+                line_dash="dot",
+                line_color="darkblue",
+                annotation_text=f"Extensión {ratio:.3f}: ${price:.2f}",
+                annotation_position="left"
+            )
+
+    return fig
+
+
+# Agrega barras nuevas a una figura ya construida (modo en vivo) sin volver a crearla.
+# Las barras con la misma fecha que la última vela la reemplazan (vela en curso). Con max_candles > 0
+# se conservan solo las últimas velas, así que lo que se envía al navegador no crece con el tiempo.
+def extend_fibonacci_figure(fig, new_bars, max_candles=DEFAULT_MAX_CANDLES):
+    if new_bars.empty:
+        return fig
+
+    candles = fig.data[0]
+    dates = np.asarray(candles.x, dtype=np.float64)
+    new_dates = _dates_to_ms(new_bars.index.values)
+    keep = np.searchsorted(dates, new_dates[0], side="left")
+
+    def combine(old, new):
+        values = np.concatenate([np.asarray(old, dtype=np.float64)[:keep], new])
+        return values[-max_candles:] if max_candles > 0 else values
+
+    open_values = new_bars['Open'].to_numpy(dtype=np.float64)
+    close_values = new_bars['Close'].to_numpy(dtype=np.float64)
+    with fig.batch_update():
+        candles.x = combine(candles.x, new_dates)
+        candles.open = combine(candles.open, open_values)
+        candles.high = combine(candles.high, new_bars['High'].to_numpy(dtype=np.float64))
+        candles.low = combine(candles.low, new_bars['Low'].to_numpy(dtype=np.float64))
+        candles.close = combine(candles.close, close_values)
+
+        for trace in fig.data:
+            if trace.name == "Volumen" and 'Volume' in new_bars.columns:
+                rising = (close_values > open_values).astype(np.int8)
+                trace.x = combine(trace.x, new_dates)
+                trace.y = combine(trace.y, new_bars['Volume'].to_numpy(dtype=np.float64))
+                trace.marker.color = combine(trace.marker.color, rising)
+    return fig
+
+
+# Mueve solo las líneas de los niveles que cambiaron (ratio -> precio, o None para ocultarla)
+# y los marcadores de los extremos, en lugar de volver a llamar add_hline para todos los niveles.
+def move_fibonacci_levels(fig, changed_levels, fib_data=None):
+    if not changed_levels and fib_data is None:
+        return fig
+
+    names = {_level_name(float(ratio)): (float(ratio), price) for ratio, price in changed_levels.items()}
+    with fig.batch_update():
+        for shape in fig.layout.shapes:
+            if shape.name in names:
+                price = names[shape.name][1]
+                shape.visible = price is not None
+                if price is not None:
+                    shape.y0 = shape.y1 = price
+        for annotation in fig.layout.annotations:
+            if annotation.name in names:
+                ratio, price = names[annotation.name]
+                annotation.visible = price is not None
+                if price is not None:
+                    annotation.y = price
+                    annotation.text = _level_text(ratio, price)
+
+        if fib_data is not None:
+            for trace in fig.data:
+                if trace.name == "Puntos Extremos":
+                    trace.x = _dates_to_ms([fib_data['min_idx'], fib_data['max_idx']])
+                    trace.y = np.array([float(fib_data['min_price']), float(fib_data['max_price'])])
+    return fig
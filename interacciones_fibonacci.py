@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Ancho de la banda alrededor de cada nivel (en proporción de su precio) para contar un toque
+DEFAULT_TOUCH_TOLERANCE = 0.005
+
+
+# Suma 1 a cada nivel de los intervalos [starts, ends) por barra con un arreglo de diferencias:
+# cuesta O(barras + niveles) sin importar cuántos niveles abarque cada intervalo.
+def _interval_counts(starts, ends, size):
+    valid = starts < ends
+    diff = np.bincount(starts[valid], minlength=size + 1) - np.bincount(ends[valid], minlength=size + 1)
+    return np.cumsum(diff[:size])
+
+
+# Cuenta cómo interactúa el precio con cada nivel dentro de una banda de ±tolerance:
+#   - toque: el rango de la barra (mínimo a máximo) entra en la banda
+#   - rebote: la barra toca el nivel y cierra fuera de la banda del mismo lado de donde venía
+#     (el cierre anterior; la apertura para la primera barra)
+#   - ruptura: la barra toca el nivel y cierra fuera de la banda del lado contrario
+# Los toques que cierran dentro de la banda no cuentan como rebote ni como ruptura.
+#
+# Con los niveles ordenados por precio, los que toca una barra forman un rango contiguo que se obtiene
+# con searchsorted sobre los bordes de las bandas; lo mismo ocurre con los niveles por encima o por
+# debajo de cada cierre. Así cada barra aporta unos cuantos intervalos en lugar de compararse con
+# todos los niveles: O(barras · log niveles) en tiempo y O(barras + niveles) en memoria.
+# Devuelve un DataFrame con una fila por nivel, en el orden del diccionario recibido.
+def level_interactions(data, levels, tolerance=DEFAULT_TOUCH_TOLERANCE):
+    ratios = np.array([float(ratio) for ratio in levels], dtype=np.float64)
+    prices = np.array([float(price) for price in levels.values()], dtype=np.float64)
+    order = np.argsort(prices, kind="stable")
+    sorted_prices = prices[order]
+    band_low = sorted_prices - np.abs(sorted_prices) * tolerance
+    band_high = sorted_prices + np.abs(sorted_prices) * tolerance
+
+    highs = data['High'].to_numpy(dtype=np.float64)
+    lows = data['Low'].to_numpy(dtype=np.float64)
+    closes = data['Close'].to_numpy(dtype=np.float64)
+    previous = np.concatenate([data['Open'].to_numpy(dtype=np.float64)[:1], closes[:-1]])
+
+    # Niveles tocados: [first, last) (banda superior >= mínimo y banda inferior <= máximo)
+    first = np.searchsorted(band_high, lows, side="left")
+    last = np.searchsorted(band_low, highs, side="right")
+    # Niveles por debajo del cierre anterior: [0, below)
+    below = np.searchsorted(sorted_prices, previous, side="left")
+    # Niveles cuya banda queda por debajo del cierre: [0, closed_above); por encima: [closed_below, n)
+    closed_above = np.searchsorted(band_high, closes, side="left")
+    closed_below = np.searchsorted(band_low, closes, side="right")
+
+    size = len(sorted_prices)
+    from_above_end = np.minimum(last, below)
+    from_below_start = np.maximum(first, below)
+    touches = _interval_counts(first, last, size)
+    bounces = (_interval_counts(first, np.minimum(from_above_end, closed_above), size)
+               + _interval_counts(np.maximum(from_below_start, closed_below), last, size))
+    breaks = (_interval_counts(np.maximum(first, closed_below), from_above_end, size)
+              + _interval_counts(from_below_start, np.minimum(last, closed_above), size))
+
+    # Volver al orden original de los niveles
+    position = np.empty_like(order)
+    position[order] = np.arange(size)
+    return pd.DataFrame({
+        'ratio': ratios,
+        'price': prices,
+        'touches': touches[position],
+        'bounces': bounces[position],
+        'breaks': breaks[position],
+    })
@@ -0,0 +1,162 @@
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Límites (en segundos) de los buckets del histograma de duración por etapa
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Mediciones recientes por etapa que se conservan para los percentiles del panel
+RECENT_SAMPLES = 500
+
+# Puerto del servidor de métricas (variable FIBONACCI_METRICS_PORT; sin ella no se inicia)
+METRICS_PORT = os.environ.get("FIBONACCI_METRICS_PORT")
+
+METRIC_PREFIX = "fibonacci_stage"
+
+
+# Estadísticas acumuladas de una etapa: histograma al estilo Prometheus (buckets acumulativos,
+# suma y conteo), contador de errores y una ventana de mediciones recientes para percentiles.
+class StageStats:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds, failed=False):
+        position = bisect.bisect_left(self.buckets, seconds)
+        if position < len(self.buckets):
+            self.bucket_counts[position] += 1
+        self.count += 1
+        self.total += seconds
+        self.errors += int(failed)
+        self.recent.append(seconds)
+
+    # Percentil de las mediciones recientes (None si no hay ninguna)
+    def percentile(self, q):
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# Registro compartido por todas las sesiones del proceso
+_stats = {}
+_lock = threading.Lock()
+
+# Etapas medidas en la ejecución actual del script (una lista por hilo: Streamlit usa un hilo por sesión)
+_trace = threading.local()
+
+
+def observe(stage, seconds, failed=False):
+    with _lock:
+        stats = _stats.get(stage)
+        if stats is None:
+            stats = _stats[stage] = StageStats()
+        stats.observe(seconds, failed)
+    steps = getattr(_trace, "steps", None)
+    if steps is not None:
+        steps.append((stage, seconds))
+
+
+# Mide el bloque como una etapa: with timed("niveles"): ...
+# Los errores se cuentan y se vuelven a lanzar. Las excepciones de control de Streamlit (rerun, stop)
+# y KeyboardInterrupt derivan de BaseException y no cuentan como errores.
+@contextmanager
+def timed(stage):
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        observe(stage, time.perf_counter() - start, failed)
+
+
+# Empieza a registrar las etapas de una ejecución (por ejemplo, cada vez que corre app.py)
+def start_trace():
+    _trace.steps = []
+
+
+# Etapas registradas desde start_trace en este hilo: lista de (etapa, segundos)
+def current_trace():
+    return list(getattr(_trace, "steps", None) or [])
+
+
+# Resumen por etapa para mostrar en la interfaz
+def stage_summary():
+    with _lock:
+        return [{
+            'stage': stage,
+            'count': stats.count,
+            'errors': stats.errors,
+            'mean': stats.total / stats.count if stats.count else None,
+            'p50': stats.percentile(0.5),
+            'p95': stats.percentile(0.95),
+        } for stage, stats in sorted(_stats.items())]
+
+
+# Métricas en el formato de texto de Prometheus (histograma de segundos y contadores por etapa)
+def render_prometheus():
+    lines = [
+        f"# HELP {METRIC_PREFIX}_seconds Duración de cada etapa del análisis.",
+        f"# TYPE {METRIC_PREFIX}_seconds histogram",
+    ]
+    counters = [
+        f"# HELP {METRIC_PREFIX}_errors_total Ejecuciones de cada etapa que terminaron con error.",
+        f"# TYPE {METRIC_PREFIX}_errors_total counter",
+    ]
+    with _lock:
+        for stage, stats in sorted(_stats.items()):
+            cumulative = 0
+            for limit, bucket_count in zip(stats.buckets, stats.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_PREFIX}_seconds_bucket{{stage="{stage}",le="{limit}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.count}')
+            lines.append(f'{METRIC_PREFIX}_seconds_sum{{stage="{stage}"}} {stats.total}')
+            lines.append(f'{METRIC_PREFIX}_seconds_count{{stage="{stage}"}} {stats.count}')
+            counters.append(f'{METRIC_PREFIX}_errors_total{{stage="{stage}"}} {stats.errors}')
+    return "\n".join(lines + counters) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Sin registro por petición
+
+
+_server = None
+
+
+# Inicia (una sola vez por proceso) un servidor HTTP en segundo plano que expone /metrics.
+# Devuelve el puerto, o None si no se configuró o no se pudo abrir.
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1"):
+    global _server
+    if port is None:
+        return None
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            except OSError:
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server.server_address[1]
@@ -0,0 +1,140 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from niveles_fibonacci import fibonacci_levels_batch, RETRACEMENT_RATIOS
+
+# Trayectorias simuladas en cada bloque (acota la memoria: bloque x barras x niveles)
+DEFAULT_SHARD_SIZE = 10_000
+
+# Métodos de simulación: remuestreo de barras históricas o rendimientos normales
+METHODS = ("bootstrap", "normal")
+
+
+# Barras relativas del historial: rendimiento cierre a cierre y máximo/mínimo relativos al cierre
+def _relative_bars(data):
+    closes = data['Close'].to_numpy(dtype=np.float64)
+    returns = closes[1:] / closes[:-1] - 1
+    high_excursion = data['High'].to_numpy(dtype=np.float64)[1:] / closes[1:]
+    low_excursion = data['Low'].to_numpy(dtype=np.float64)[1:] / closes[1:]
+    return returns, high_excursion, low_excursion
+
+
+# Genera un bloque de trayectorias OHLC (paths x bars) a partir de las barras relativas.
+# El rango de cada vela (máximo y mínimo respecto al cierre) siempre se remuestrea del historial;
+# los rendimientos se remuestrean junto con él ("bootstrap") o se toman de una normal con la media
+# y la desviación del historial ("normal").
+def simulate_paths(returns, high_excursion, low_excursion, paths, bars, method="bootstrap", seed=None):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(returns), (paths, bars))
+    if method == "normal":
+        growth = rng.normal(returns.mean(), returns.std(), (paths, bars))
+    else:
+        growth = returns[picks]
+    growth += 1
+    closes = np.cumprod(growth, axis=1, out=growth)
+    return closes * high_excursion[picks], closes * low_excursion[picks]
+
+
+# Primera posición (a lo largo del eje 1) donde la máscara es verdadera; `horizon` si nunca lo es
+def _first_true(mask, horizon):
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), horizon)
+
+
+# Cuenta toques, rebotes y rupturas de cada nivel en un bloque de trayectorias.
+# Para cada trayectoria se calculan los niveles sobre las primeras `period` barras (extremos del período
+# con la misma validación de cronología que calculate_fibonacci_levels) y se evalúan las `horizon`
+# barras siguientes:
+#   - toque: el precio alcanza el nivel
+#   - rebote: después del toque regresa al nivel anterior (menos profundo) antes de cruzar el siguiente
+#   - ruptura: después del toque cruza el siguiente nivel (más profundo) antes de rebotar
+# Si ambos ocurren en la misma barra se cuenta como ruptura (criterio conservador, como el backtest).
+def _evaluate_shard(returns, high_excursion, low_excursion, trend_type, paths, period, horizon, method, seed):
+    highs, lows = simulate_paths(returns, high_excursion, low_excursion, paths, period + horizon, method, seed)
+
+    max_pos = highs[:, :period].argmax(axis=1)
+    min_pos = lows[:, :period].argmin(axis=1)
+    rows = np.arange(paths)
+    max_prices = highs[rows, max_pos]
+    min_prices = lows[rows, min_pos]
+
+    bearish = trend_type == "Bajista"
+    valid = (min_pos >= max_pos) if bearish else (max_pos >= min_pos)
+    levels = fibonacci_levels_batch(np.column_stack([min_prices, max_prices]), RETRACEMENT_RATIOS,
+                                    trend_type)[valid]
+
+    # Barras de evaluación x niveles: en tendencia alcista el retroceso baja hacia los niveles
+    # (el nivel k-1 es más profundo que el k); en bajista sube hacia ellos
+    future_highs = highs[valid, period:, np.newaxis]
+    future_lows = lows[valid, period:, np.newaxis]
+    if bearish:
+        reached = future_highs >= levels[:, np.newaxis, :]
+        recovered = future_lows <= levels[:, np.newaxis, :]
+    else:
+        reached = future_lows <= levels[:, np.newaxis, :]
+        recovered = future_highs >= levels[:, np.newaxis, :]
+
+    # Niveles evaluados: 23.6% a 78.6% (el 0% y el 100% son los extremos del movimiento)
+    steps = np.arange(horizon)[np.newaxis, :, np.newaxis]
+    hit_pos = _first_true(reached[:, :, 1:-1], horizon)
+    after_hit = steps >= hit_pos[:, np.newaxis, :]
+    break_pos = _first_true(reached[:, :, :-2] & after_hit, horizon)
+    bounce_pos = _first_true(recovered[:, :, 2:] & (steps > hit_pos[:, np.newaxis, :]), horizon)
+
+    hits = hit_pos < horizon
+    bounces = hits & (bounce_pos < break_pos)
+    breaks = hits & (break_pos < horizon) & ~bounces
+    return {
+        'paths': int(valid.sum()),
+        'hits': hits.sum(axis=0),
+        'bounces': bounces.sum(axis=0),
+        'breaks': breaks.sum(axis=0),
+        'bars_to_hit': np.where(hits, hit_pos, 0).sum(axis=0),
+    }
+
+
+# Evaluación Monte Carlo de qué tan seguido el precio respeta cada nivel de Fibonacci.
+# Se simulan `paths` trayectorias a partir de los rendimientos del historial y se reparten en
+# bloques de `shard_size` entre un grupo de procesos; cada bloque devuelve solo sus conteos.
+# Devuelve un DataFrame con una fila por nivel (23.6% a 78.6%).
+def monte_carlo_levels(data, trend_type="Alcista", paths=10_000, period=90, horizon=60,
+                       method="bootstrap", seed=None, shard_size=DEFAULT_SHARD_SIZE, max_workers=None):
+    if method not in METHODS:
+        raise ValueError(f"method debe ser uno de {METHODS}")
+    if paths < 1:
+        raise ValueError("paths debe ser al menos 1")
+    if len(data) < 2:
+        raise ValueError("Se necesitan al menos dos barras para estimar los rendimientos")
+
+    returns, high_excursion, low_excursion = _relative_bars(data)
+    sizes = [min(shard_size, paths - start) for start in range(0, paths, shard_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(returns, high_excursion, low_excursion, trend_type, size, period, horizon, method, shard_seed)
+            for size, shard_seed in zip(sizes, seeds)]
+
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(args)))
+    if workers == 1:
+        results = [_evaluate_shard(*shard_args) for shard_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_shard, *zip(*args)))
+
+    valid_paths = sum(result['paths'] for result in results)
+    hits = sum(result['hits'] for result in results)
+    bounces = sum(result['bounces'] for result in results)
+    breaks = sum(result['breaks'] for result in results)
+    bars_to_hit = sum(result['bars_to_hit'] for result in results)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'ratio': RETRACEMENT_RATIOS[1:-1],
+            'paths': valid_paths,
+            'hits': hits,
+            'hit_rate': hits / valid_paths if valid_paths else np.nan,
+            'bounce_rate': bounces / hits,
+            'break_rate': breaks / hits,
+            'avg_bars_to_hit': bars_to_hit / hits,
+        })
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# Ratios de retroceso mostrados en la aplicación (del 0% al 100%)
+RETRACEMENT_RATIOS = np.array([0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0])
+
+# Ratios de extensión (objetivos más allá del movimiento original)
+EXTENSION_RATIOS = np.array([1.272, 1.618])
+
+
+# Convierte el tipo de tendencia en una máscara booleana (True = bajista) para N tickers
+def _bearish_mask(trend_type, n):
+    if isinstance(trend_type, str):
+        if trend_type not in ("Alcista", "Bajista"):
+            raise ValueError(f"Tipo de tendencia no reconocido: {trend_type}")
+        return np.full(n, trend_type == "Bajista")
+
+    mask = np.asarray(trend_type)
+    if mask.dtype.kind in ("U", "O"):
+        mask = mask == "Bajista"
+    mask = mask.astype(bool).ravel()
+    if mask.shape[0] != n:
+        raise ValueError("trend_type debe tener un valor por ticker")
+    return mask
+
+
+# Motor vectorizado: calcula todos los niveles para N tickers en una sola operación.
+#   swings: arreglo (N, 2) con [mínimo, máximo] de cada ticker
+#   ratios: vector arbitrario de ratios (retrocesos y/o extensiones)
+#   trend_type: "Alcista", "Bajista" o un arreglo con un valor por ticker
+# Devuelve un arreglo (N, len(ratios)) con el precio de cada nivel.
+def fibonacci_levels_batch(swings, ratios=RETRACEMENT_RATIOS, trend_type="Alcista"):
+    swings = np.asarray(swings, dtype=np.float64)
+    if swings.ndim == 1:
+        swings = swings.reshape(1, -1)
+    if swings.ndim != 2 or swings.shape[1] != 2:
+        raise ValueError("swings debe tener forma (N, 2) con [mínimo, máximo] por ticker")
+
+    ratios = np.asarray(ratios, dtype=np.float64).ravel()
+    min_prices = swings[:, 0:1]
+    max_prices = swings[:, 1:2]
+    diff = max_prices - min_prices
+
+    # Alcista: se mide desde el mínimo hacia arriba; bajista: desde el máximo hacia abajo
+    bearish = _bearish_mask(trend_type, swings.shape[0])[:, np.newaxis]
+    anchor = np.where(bearish, max_prices, min_prices)
+    direction = np.where(bearish, -1.0, 1.0)
+
+    return anchor + direction * diff * ratios[np.newaxis, :]
+
+
+# Función para calcular retrocesos de Fibonacci de un solo ticker
+def calculate_fibonacci_levels(data, trend_type):
+    try:
+        min_price = data['Low'].min()
+        max_price = data['High'].max()
+        min_idx = data['Low'].idxmin()
+        max_idx = data['High'].idxmax()
+
+        # Verificar cronología para determinar si el análisis es relevante
+        # Manejo seguro de la comparación de fechas
+        if isinstance(min_idx, pd.Series):
+            min_idx_value = min_idx.iloc[0]
+        else:
+            min_idx_value = min_idx
+
+        if isinstance(max_idx, pd.Series):
+            max_idx_value = max_idx.iloc[0]
+        else:
+            max_idx_value = max_idx
+
+        if trend_type == "Alcista":
+            # Si el máximo ocurre antes que el mínimo en una tendencia alcista, no es válido
+            if max_idx_value < min_idx_value:
+                return None, "La cronología de puntos extremos no es adecuada para el tipo de tendencia seleccionada."
+        else:  # Bajista
+            # Si el mínimo ocurre antes que el máximo en una tendencia bajista, no es válido
+            if min_idx_value < max_idx_value:
+                return None, "La cronología de puntos extremos no es adecuada para el tipo de tendencia seleccionada."
+
+        # Calcular los niveles de retroceso con el motor vectorizado (un solo ticker)
+        prices = fibonacci_levels_batch([[min_price, max_price]], RETRACEMENT_RATIOS, trend_type)[0]
+        levels = dict(zip(RETRACEMENT_RATIOS.tolist(), prices.tolist()))
+
+        return {
+            'levels': levels,
+            'min_price': min_price,
+            'max_price': max_price,
+            'min_idx': min_idx,
+            'max_idx': max_idx
+        }, None
+    except Exception as e:
+        return None, f"Error al calcular niveles de Fibonacci: {str(e)}"
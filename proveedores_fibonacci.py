@@ -0,0 +1,185 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from almacen_fibonacci import OHLCVStore
+from sintetico_fibonacci import synthetic_ohlcv
+
+# Proveedor por defecto (variable de entorno FIBONACCI_PROVIDER: yahoo, archivo, sintetico o repeticion)
+DEFAULT_PROVIDER = os.environ.get("FIBONACCI_PROVIDER", "yahoo")
+
+# Carpeta del proveedor de archivos (CSV, Parquet o un almacén OHLCVStore)
+DEFAULT_PROVIDER_DIR = os.environ.get(
+    "FIBONACCI_PROVIDER_DIR",
+    os.path.join(os.path.expanduser("~"), "datos_fibonacci")
+)
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+# Todos los proveedores devuelven un DataFrame OHLCV con índice de fechas sin zona horaria,
+# ordenado y acotado a [start, end). Con start None se devuelve todo el historial disponible.
+# `remote` indica si cada consulta sale por la red: solo en ese caso se usan el almacén local
+# y la descarga por bloques de datos_fibonacci.
+class MarketDataProvider(ABC):
+    name = "base"
+    remote = False
+
+    @abstractmethod
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        pass
+
+
+# Acota un historial al rango pedido (el índice ya está ordenado)
+def _clip(data, start=None, end=None):
+    if start is not None:
+        data = data.iloc[data.index.searchsorted(pd.Timestamp(start), side="left"):]
+    if end is not None:
+        data = data.iloc[:data.index.searchsorted(pd.Timestamp(end), side="left")]
+    return data
+
+
+# Yahoo Finance a través de yfinance (requiere conexión)
+class YahooProvider(MarketDataProvider):
+    name = "yahoo"
+    remote = True
+
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        # yfinance se importa aquí para no cargarlo en páginas que no descargan datos
+        import yfinance as yf
+
+        # Método recomendado con la nueva versión de yfinance
+        ticker_obj = yf.Ticker(ticker)
+        if start is None:
+            data = ticker_obj.history(period="max", interval=interval)
+        else:
+            data = ticker_obj.history(start=start, end=end, interval=interval)
+
+        # Eliminar zona horaria del índice
+        if data.index.tzinfo is not None:
+            data.index = data.index.tz_localize(None)
+        return data
+
+
+# Archivos locales en una carpeta. Para cada ticker se busca, en este orden:
+#   <ticker>.parquet, <ticker>.csv y una carpeta de OHLCVStore (lectura mapeada en memoria)
+# Los historiales intradía usan el nombre <ticker>@<intervalo> (por ejemplo AAPL@5m.csv).
+class FileProvider(MarketDataProvider):
+    name = "archivo"
+
+    def __init__(self, root=DEFAULT_PROVIDER_DIR):
+        self.root = root
+        self.store = OHLCVStore(root)
+
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        key = ticker if interval == "1d" else f"{ticker}@{interval}"
+
+        parquet_path = os.path.join(self.root, f"{key}.parquet")
+        csv_path = os.path.join(self.root, f"{key}.csv")
+        if os.path.exists(parquet_path):
+            # pd.read_parquet necesita pyarrow o fastparquet
+            data = pd.read_parquet(parquet_path)
+        elif os.path.exists(csv_path):
+            data = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+        else:
+            data = self.store.read(key)
+            if data is None:
+                raise FileNotFoundError(f"No se encontró {key} en {self.root}")
+
+        data = self._normalize(data)
+        return _clip(data, start, end)
+
+    # Nombres de columna como los de yfinance y un índice de fechas ordenado sin zona horaria
+    @staticmethod
+    def _normalize(data):
+        data = data.rename(columns={c: c.strip().title() for c in data.columns if isinstance(c, str)})
+        if not isinstance(data.index, pd.DatetimeIndex):
+            data.index = pd.to_datetime(data.index)
+        if data.index.tz is not None:
+            data.index = data.index.tz_localize(None)
+        data.index.name = "Date"
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        return data[[c for c in OHLCV_COLUMNS if c in data.columns]]
+
+
+# Datos sintéticos deterministas (sintetico_fibonacci) para trabajar sin red.
+# La semilla depende del ticker, así que cada ticker siempre produce la misma serie.
+class SyntheticProvider(MarketDataProvider):
+    name = "sintetico"
+
+    def __init__(self, bars=2520, start_price=100.0, drift=0.0003, volatility=0.015, seed=0):
+        self.bars = bars
+        self.start_price = start_price
+        self.drift = drift
+        self.volatility = volatility
+        self.seed = seed
+
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        rng = np.random.default_rng([self.seed, zlib.crc32(f"{ticker}@{interval}".encode("utf-8"))])
+        freq = "B" if interval == "1d" else interval.replace("m", "min")
+        data = synthetic_ohlcv(self.bars, self.start_price, self.drift, self.volatility, seed=rng, freq=freq)
+        return _clip(data, start, end)
+
+
+# Repite un historial como si llegara en vivo (para probar el modo en vivo sin mercado abierto).
+# Al pedir un ticker por primera vez se muestra todo menos las últimas `reserve` barras, y desde ese
+# momento se revela una barra nueva cada `bar_seconds` segundos. La última barra visible se va formando:
+# su máximo, mínimo y cierre avanzan desde la apertura hasta los valores reales durante su intervalo.
+class ReplayProvider(MarketDataProvider):
+    name = "repeticion"
+
+    def __init__(self, base=None, reserve=500, bar_seconds=5.0):
+        self.base = base or SyntheticProvider()
+        self.reserve = reserve
+        self.bar_seconds = bar_seconds
+        self._replays = {}
+        self._lock = threading.Lock()
+
+    def history(self, ticker, start=None, end=None, interval="1d"):
+        key = (ticker, interval)
+        with self._lock:
+            if key not in self._replays:
+                data = self.base.history(ticker, interval=interval)
+                self._replays[key] = (data, max(1, len(data) - self.reserve), time.monotonic())
+            data, first_visible, started = self._replays[key]
+
+        elapsed = (time.monotonic() - started) / self.bar_seconds
+        visible = first_visible + int(elapsed) + 1
+        if visible < len(data):
+            data = self._forming(data.iloc[:visible], elapsed - int(elapsed))
+        return _clip(data, start, end)
+
+    # Última vela a medio formar (progress entre 0 y 1)
+    @staticmethod
+    def _forming(data, progress):
+        data = data.copy()
+        last = data.iloc[-1]
+        open_price = last['Open']
+        data.iloc[-1, data.columns.get_loc('High')] = open_price + progress * (last['High'] - open_price)
+        data.iloc[-1, data.columns.get_loc('Low')] = open_price - progress * (open_price - last['Low'])
+        data.iloc[-1, data.columns.get_loc('Close')] = open_price + progress * (last['Close'] - open_price)
+        if 'Volume' in data.columns:
+            data.iloc[-1, data.columns.get_loc('Volume')] = round(progress * last['Volume'])
+        return data
+
+
+PROVIDERS = {
+    "yahoo": YahooProvider,
+    "archivo": FileProvider,
+    "sintetico": SyntheticProvider,
+    "repeticion": ReplayProvider,
+}
+
+
+# Crea un proveedor por nombre (por defecto el de FIBONACCI_PROVIDER)
+def get_provider(name=None, **options):
+    name = name or DEFAULT_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"Proveedor desconocido: {name}. Opciones: {', '.join(PROVIDERS)}")
+    return PROVIDERS[name](**options)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+# Semilla por defecto (la misma que usaba el ejemplo de análisis técnico)
+DEFAULT_SEED = 42
+
+
+# Acepta una semilla o un np.random.Generator ya creado
+def _generator(seed):
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+# Precio inicial como escalar o como columna (una entrada por trayectoria)
+def _as_start(start, values):
+    start = np.asarray(start, dtype=values.dtype)
+    if values.ndim == 2 and start.ndim == 1:
+        return start[:, np.newaxis]
+    return start
+
+
+# Régimen de tendencia: cada barra multiplica a la anterior por (1 + rendimiento normal).
+# La primera barra es `start`; drift y volatility son proporciones por barra (0.005 = 0.5%).
+# Con paths=None devuelve un vector de `bars` precios; si no, un arreglo (paths, bars).
+# Todo se calcula en un solo arreglo con un producto acumulado (sin ciclos por barra).
+def trend_regime(start, bars, drift, volatility, paths=None, seed=None, dtype=np.float64):
+    rng = _generator(seed)
+    shape = (bars,) if paths is None else (paths, bars)
+    values = rng.standard_normal(shape, dtype=dtype)
+    values *= volatility
+    values += 1 + drift
+    values[..., 0] = 1
+    np.cumprod(values, axis=-1, out=values)
+    values *= _as_start(start, values)
+    return values
+
+
+# Régimen de retroceso: en cada barra el precio recorre `speed` de la distancia que le falta
+# hasta `target` (con ruido multiplicativo). La distancia decae como un producto acumulado:
+#   d[i] = d[i-1] * (1 - speed * (1 + ruido))
+def retracement_regime(start, target, bars, speed=0.15, noise=0.005, paths=None, seed=None, dtype=np.float64):
+    rng = _generator(seed)
+    shape = (bars,) if paths is None else (paths, bars)
+    values = rng.standard_normal(shape, dtype=dtype)
+    values *= -speed * noise
+    values += 1 - speed
+    values[..., 0] = 1
+    np.cumprod(values, axis=-1, out=values)
+
+    start = _as_start(start, values)
+    target = _as_start(target, values)
+    values *= start - target
+    values += target
+    return values
+
+
+# Tendencia alcista, retroceso hasta el nivel `level` del impulso y continuación de la tendencia.
+# `splits` reparte las barras entre los tres tramos. Cada tramo empieza donde terminó el anterior.
+# Devuelve (impulso, retroceso, continuación) como vectores o, con `paths`, arreglos (paths, barras).
+def trend_with_retracement(bars=100, start_price=100.0, drift=0.005, volatility=0.015, level=0.618,
+                           splits=(0.6, 0.25, 0.15), paths=None, seed=DEFAULT_SEED, dtype=np.float64):
+    rng = _generator(seed)
+    up_bars, pullback_bars, continuation_bars = (int(bars * split) for split in splits)
+
+    uptrend = trend_regime(start_price, up_bars, drift, volatility, paths, rng, dtype)
+    high = uptrend[..., -1]
+    target = start_price + (high - start_price) * level
+    pullback = retracement_regime(high, target, pullback_bars, paths=paths, seed=rng, dtype=dtype)
+    continuation = trend_regime(pullback[..., -1], continuation_bars, drift, volatility, paths, rng, dtype)
+    return uptrend, pullback, continuation
+
+
+# Historial OHLCV sintético con índice de fechas (el cierre sigue una tendencia con ruido).
+# Los máximos y mínimos se abren alrededor de la vela con una amplitud proporcional a la volatilidad.
+def synthetic_ohlcv(bars, start_price=100.0, drift=0.0003, volatility=0.015, seed=DEFAULT_SEED,
+                    freq="B", end=None):
+    rng = _generator(seed)
+    closes = trend_regime(start_price, bars, drift, volatility, seed=rng)
+    opens = np.empty_like(closes)
+    opens[0] = start_price
+    opens[1:] = closes[:-1]
+    spread = np.abs(rng.standard_normal((2, bars)))
+    spread *= volatility / 2 * closes
+
+    end = pd.Timestamp.now().floor("D") if end is None else pd.Timestamp(end)
+    index = pd.date_range(end=end, periods=bars, freq=freq, name="Date")
+    return pd.DataFrame({
+        "Open": opens,
+        "High": np.maximum(opens, closes) + spread[0],
+        "Low": np.minimum(opens, closes) - spread[1],
+        "Close": closes,
+        "Volume": rng.integers(100_000, 10_000_000, bars).astype(np.float64),
+    }, index=index)
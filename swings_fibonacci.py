@@ -0,0 +1,139 @@
+import numpy as np
+
+from niveles_fibonacci import fibonacci_levels_batch, RETRACEMENT_RATIOS
+
+# Movimiento mínimo (en proporción del precio) para confirmar un punto de giro
+DEFAULT_SWING_THRESHOLD = 0.05
+
+
+# Detector de puntos de giro tipo zigzag que procesa una barra a la vez en O(1).
+# Un máximo se confirma cuando el precio cae `threshold` desde él, y un mínimo cuando
+# sube `threshold` desde él; nunca se vuelve a recorrer la serie.
+class SwingDetector:
+    def __init__(self, threshold=DEFAULT_SWING_THRESHOLD):
+        if threshold <= 0:
+            raise ValueError("El umbral debe ser mayor que cero")
+        self.threshold = threshold
+        self.direction = 0  # 1 = buscando máximo, -1 = buscando mínimo, 0 = sin dirección aún
+        self.last_pivot = None
+        self.position = -1
+        # Extremos provisionales: (precio, posición, marca de tiempo)
+        self._high = None
+        self._low = None
+
+    # Procesa una barra; devuelve el punto de giro confirmado (o None)
+    def update(self, timestamp, high, low):
+        self.position += 1
+        position = self.position
+
+        if self.direction == 0:
+            if self._high is None or high > self._high[0]:
+                self._high = (high, position, timestamp)
+            if self._low is None or low < self._low[0]:
+                self._low = (low, position, timestamp)
+
+            if self._high[0] >= self._low[0] * (1 + self.threshold) and self._low[1] < self._high[1]:
+                return self._confirm('min', self._low, 1, self._high)
+            if self._low[0] <= self._high[0] * (1 - self.threshold) and self._high[1] < self._low[1]:
+                return self._confirm('max', self._high, -1, self._low)
+            return None
+
+        if self.direction == 1:
+            if high > self._high[0]:
+                self._high = (high, position, timestamp)
+            elif low <= self._high[0] * (1 - self.threshold):
+                return self._confirm('max', self._high, -1, (low, position, timestamp))
+        else:
+            if low < self._low[0]:
+                self._low = (low, position, timestamp)
+            elif high >= self._low[0] * (1 + self.threshold):
+                return self._confirm('min', self._low, 1, (high, position, timestamp))
+        return None
+
+    def _confirm(self, kind, extreme, new_direction, new_candidate):
+        pivot = {'kind': kind, 'price': extreme[0], 'position': extreme[1], 'timestamp': extreme[2]}
+        self.last_pivot = pivot
+        self.direction = new_direction
+        if new_direction == 1:
+            self._high = new_candidate
+        else:
+            self._low = new_candidate
+        return pivot
+
+    # Punto extremo provisional del movimiento en curso (aún sin confirmar)
+    def pending_pivot(self):
+        if self.direction == 1:
+            extreme, kind = self._high, 'max'
+        elif self.direction == -1:
+            extreme, kind = self._low, 'min'
+        else:
+            return None
+        return {'kind': kind, 'price': extreme[0], 'position': extreme[1], 'timestamp': extreme[2]}
+
+
+# Construye el diccionario de un movimiento (de un punto de giro al siguiente) con sus niveles
+def _swing_leg(start, end, ratios):
+    if start['kind'] == 'min':
+        trend_type, low, high = "Alcista", start, end
+    else:
+        trend_type, low, high = "Bajista", end, start
+    prices = fibonacci_levels_batch([[low['price'], high['price']]], ratios, trend_type)[0]
+    return {
+        'trend_type': trend_type,
+        'levels': dict(zip(np.asarray(ratios, dtype=float).tolist(), prices.tolist())),
+        'min_price': low['price'],
+        'max_price': high['price'],
+        'min_idx': low['timestamp'],
+        'max_idx': high['timestamp'],
+        'confirmed': end.get('confirmed', True)
+    }
+
+
+# Genera cada movimiento significativo con sus niveles conforme llegan las barras.
+# Recorre la serie una sola vez, así que funciona con historiales intradía de millones de barras.
+# Se puede pasar un detector propio para conservar su estado entre llamadas.
+def iter_swing_levels(timestamps, highs, lows, threshold=DEFAULT_SWING_THRESHOLD, ratios=RETRACEMENT_RATIOS,
+                      detector=None):
+    if detector is None:
+        detector = SwingDetector(threshold)
+    previous = detector.last_pivot
+    for timestamp, high, low in zip(timestamps, highs, lows):
+        pivot = detector.update(timestamp, high, low)
+        if pivot is not None:
+            if previous is not None:
+                yield _swing_leg(previous, pivot, ratios)
+            previous = pivot
+
+
+# Lista completa de movimientos de un DataFrame OHLC. Con include_pending se agrega el
+# movimiento en curso (del último punto de giro confirmado al extremo provisional).
+def detect_swings(data, threshold=DEFAULT_SWING_THRESHOLD, ratios=RETRACEMENT_RATIOS, include_pending=False):
+    detector = SwingDetector(threshold)
+    highs = data['High'].to_numpy(dtype=np.float64).tolist()
+    lows = data['Low'].to_numpy(dtype=np.float64).tolist()
+    # Se usan posiciones como marca de tiempo y solo se traducen a fechas las de los puntos de giro
+    legs = list(iter_swing_levels(range(len(highs)), highs, lows, ratios=ratios, detector=detector))
+
+    previous = detector.last_pivot
+    if include_pending and previous is not None:
+        pending = detector.pending_pivot()
+        if pending is not None and pending['position'] > previous['position']:
+            pending['confirmed'] = False
+            legs.append(_swing_leg(previous, pending, ratios))
+
+    for leg in legs:
+        leg['min_idx'] = data.index[leg['min_idx']]
+        leg['max_idx'] = data.index[leg['max_idx']]
+    return legs
+
+
+# Niveles del movimiento significativo más reciente que coincide con el tipo de tendencia.
+# Devuelve (fib_data, error) con el mismo formato que calculate_fibonacci_levels.
+def latest_swing_levels(data, trend_type, threshold=DEFAULT_SWING_THRESHOLD):
+    try:
+        for leg in reversed(detect_swings(data, threshold, include_pending=True)):
+            if leg['trend_type'] == trend_type:
+                return leg, None
+        return None, f"No se encontró un movimiento {trend_type.lower()} mayor al {threshold*100:.0f}% en el período."
+    except Exception as e:
+        return None, f"Error al detectar puntos de giro: {str(e)}"
@@ -0,0 +1,128 @@
+from collections import deque
+
+import numpy as np
+
+from niveles_fibonacci import fibonacci_levels_batch, RETRACEMENT_RATIOS
+
+# Mismo mensaje que calculate_fibonacci_levels
+CHRONOLOGY_ERROR = "La cronología de puntos extremos no es adecuada para el tipo de tendencia seleccionada."
+
+
+# Niveles de Fibonacci de las últimas `days` barras mantenidos de forma incremental (days == 0: todo).
+# Dos colas monótonas guardan los candidatos a máximo y a mínimo de la ventana; cada barra entra y sale
+# de cada cola una sola vez, así que agregar una barra cuesta O(1) amortizado en lugar de recorrer
+# el período. Los empates se resuelven con la primera aparición, igual que idxmin/idxmax.
+class RollingFibonacciLevels:
+    def __init__(self, days, trend_type="Alcista", ratios=RETRACEMENT_RATIOS):
+        if days < 0:
+            raise ValueError("days no puede ser negativo")
+        self.days = days
+        self.trend_type = trend_type
+        self.ratios = np.asarray(ratios, dtype=np.float64)
+        self.position = -1
+        # Candidatos (precio, posición, marca de tiempo): máximos decrecientes y mínimos crecientes
+        self._highs = deque()
+        self._lows = deque()
+        self.levels = {}
+        self.error = None
+        self._extremes = None
+
+    # Estado inicial a partir de un historial (solo se recorren las últimas `days` barras)
+    @classmethod
+    def from_data(cls, data, days, trend_type="Alcista", ratios=RETRACEMENT_RATIOS):
+        state = cls(days, trend_type, ratios)
+        window = data.iloc[-days:] if days > 0 else data
+        highs = window['High'].to_numpy(dtype=np.float64)
+        lows = window['Low'].to_numpy(dtype=np.float64)
+        for timestamp, high, low in zip(window.index, highs, lows):
+            state._push(timestamp, high, low)
+        state._refresh()
+        return state
+
+    def _push(self, timestamp, high, low):
+        # Una barra con la misma marca de tiempo que la última es la vela en curso: se reemplaza.
+        # Su máximo solo sube y su mínimo solo baja, así que los candidatos que ya descartó
+        # al entrar tampoco pueden volver a ser extremos.
+        if self.position >= 0 and timestamp == self._highs[-1][2]:
+            high = max(high, self._highs.pop()[0])
+            low = min(low, self._lows.pop()[0])
+        else:
+            self.position += 1
+        position = self.position
+
+        # Un candidato superado por una barra más reciente ya no puede ser el extremo de la ventana
+        while self._highs and self._highs[-1][0] < high:
+            self._highs.pop()
+        self._highs.append((high, position, timestamp))
+        while self._lows and self._lows[-1][0] > low:
+            self._lows.pop()
+        self._lows.append((low, position, timestamp))
+
+        # Descartar los extremos que salieron de la ventana
+        if self.days > 0:
+            oldest = position - self.days + 1
+            while self._highs[0][1] < oldest:
+                self._highs.popleft()
+            while self._lows[0][1] < oldest:
+                self._lows.popleft()
+
+    # Recalcula los niveles con los extremos actuales y devuelve solo los que cambiaron
+    # (ratio -> nuevo precio, o None si el nivel dejó de existir por la cronología).
+    # Si los extremos de la ventana son los mismos que antes no se recalcula nada.
+    def _refresh(self):
+        if self.position < 0:
+            return {}
+        max_price, max_position, _ = self._highs[0]
+        min_price, min_position, _ = self._lows[0]
+        extremes = (min_price, min_position, max_price, max_position)
+        if extremes == self._extremes:
+            return {}
+        self._extremes = extremes
+
+        if self.trend_type == "Alcista":
+            invalid = max_position < min_position
+        else:
+            invalid = min_position < max_position
+
+        if invalid:
+            levels, self.error = {}, CHRONOLOGY_ERROR
+        else:
+            prices = fibonacci_levels_batch([[min_price, max_price]], self.ratios, self.trend_type)[0]
+            levels, self.error = dict(zip(self.ratios.tolist(), prices.tolist())), None
+
+        changed = {ratio: price for ratio, price in levels.items() if self.levels.get(ratio) != price}
+        changed.update({ratio: None for ratio in self.levels if ratio not in levels})
+        self.levels = levels
+        return changed
+
+    # Agrega una barra nueva (o actualiza la vela en curso) y devuelve los niveles que cambiaron
+    # (diccionario vacío si ninguno)
+    def update(self, timestamp, high, low):
+        self._push(timestamp, float(high), float(low))
+        return self._refresh()
+
+    # Agrega varias barras (por ejemplo, las nuevas de una actualización) y devuelve los cambios acumulados
+    def extend(self, data):
+        if data.empty:
+            return {}
+        highs = data['High'].to_numpy(dtype=np.float64)
+        lows = data['Low'].to_numpy(dtype=np.float64)
+        for timestamp, high, low in zip(data.index, highs, lows):
+            self._push(timestamp, high, low)
+        return self._refresh()
+
+    # Resultado con la misma forma que calculate_fibonacci_levels: (fib_data, error)
+    def fib_data(self):
+        if self.position < 0:
+            return None, "No hay datos en la ventana."
+        if self.error:
+            return None, self.error
+        max_price, _, max_timestamp = self._highs[0]
+        min_price, _, min_timestamp = self._lows[0]
+        return {
+            'levels': dict(self.levels),
+            'min_price': min_price,
+            'max_price': max_price,
+            'min_idx': min_timestamp,
+            'max_idx': max_timestamp
+        }, None